@@ -58,6 +58,17 @@ DEV_REQUIRES = [
     "tox>=4.6.0",
 ]
 
+# Optional performance dependencies
+SPEEDUPS_REQUIRES = [
+    "orjson>=3.8.0",
+]
+
+# Optional semantic response cache dependencies
+SEMANTIC_CACHE_REQUIRES = [
+    "numpy>=1.24.0",
+    "sentence-transformers>=2.2.0",
+]
+
 # Documentation dependencies
 DOCS_REQUIRES = [
     "sphinx>=7.0.0",
@@ -94,7 +105,9 @@ setup(
     extras_require={
         "dev": DEV_REQUIRES,
         "docs": DOCS_REQUIRES,
-        "all": DEV_REQUIRES + DOCS_REQUIRES,
+        "speedups": SPEEDUPS_REQUIRES,
+        "semantic-cache": SEMANTIC_CACHE_REQUIRES,
+        "all": DEV_REQUIRES + DOCS_REQUIRES + SPEEDUPS_REQUIRES + SEMANTIC_CACHE_REQUIRES,
     },
     entry_points={
         "console_scripts": [
@@ -1,14 +1,25 @@
 import os
 import json
-from typing import Dict, Optional, Any, List, Union
+import time
+from typing import Callable, Dict, Iterator, Optional, Any, List, Union
 import logging
+import threading
 import anthropic
 from anthropic.types import MessageParam
 
 from src.config.config import Config
+from src.clients.llm_cache import CacheBackend, SingleFlight, make_cache_key
+from src.utils.json_extract import JSONObjectScanner, parse_json_object
 
 logger = logging.getLogger(__name__)
 
+# Seconds a cached response stays valid
+DEFAULT_CACHE_TTL = 3600
+
+# Client shared by components that need no client-specific settings
+_default_client: Optional["AnthropicClient"] = None
+_default_client_lock = threading.Lock()
+
 class AnthropicClient:
     """Client for interacting with Anthropic's Claude API.
     
@@ -17,32 +28,49 @@ class AnthropicClient:
     generating architecture plans, and creating code.
     """
     
-    def __init__(self, config: Config):
+    # Cached requests in flight, shared by all clients in the process
+    _in_flight = SingleFlight()
+    
+    def __init__(self, config: Config, cache: Optional[CacheBackend] = None,
+                 cache_ttl: Optional[float] = DEFAULT_CACHE_TTL):
         """Initialize the Anthropic client with configuration.
         
         Args:
             config: Configuration object containing API keys and settings
+            cache: Optional response cache consulted by generate_response
+            cache_ttl: Seconds a cached response stays valid, or None to keep
+                responses until they are evicted
         """
         self.config = config
         self.client = anthropic.Anthropic(api_key=config.anthropic_api_key)
         self.model = config.anthropic_model or "claude-3-opus-20240229"
+        # Smaller, faster model for simple requests
+        self.fast_model = config.anthropic_fast_model or "claude-3-haiku-20240307"
         self.max_tokens = config.anthropic_max_tokens or 4096
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self.cache_stats = {"hits": 0, "misses": 0}
     
-    def ask_claude(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+    def ask_claude(self, prompt: str, system_prompt: Optional[str] = None,
+                   cached_context: Optional[str] = None, model: Optional[str] = None) -> str:
         """Send a prompt to Claude and get a response.
         
         Args:
             prompt: The user prompt to send to Claude
             system_prompt: Optional system prompt to guide Claude's behavior
+            cached_context: Optional context shared by many requests. It is sent
+                as a separate system block marked for prompt caching, so repeated
+                calls with the same context only pay for it once.
+            model: Optional model to use instead of the configured default
             
         Returns:
             Claude's response as a string
         """
         try:
-            system = system_prompt or "You are a helpful AI assistant specializing in software development."
+            system = self._build_system(system_prompt, cached_context)
             
             message = self.client.messages.create(
-                model=self.model,
+                model=model or self.model,
                 max_tokens=self.max_tokens,
                 system=system,
                 messages=[
@@ -55,6 +83,116 @@ class AnthropicClient:
             logger.error(f"Error communicating with Claude: {str(e)}")
             raise
     
+    def stream_claude(self, prompt: str, system_prompt: Optional[str] = None,
+                      cached_context: Optional[str] = None, model: Optional[str] = None) -> Iterator[str]:
+        """Send a prompt to Claude and stream the response text as it arrives.
+        
+        Closing the iterator early closes the underlying stream.
+        
+        Args:
+            prompt: The user prompt to send to Claude
+            system_prompt: Optional system prompt to guide Claude's behavior
+            cached_context: Optional shared context to send as a cached system block
+            model: Optional model to use instead of the configured default
+            
+        Yields:
+            Chunks of Claude's response text
+        """
+        try:
+            system = self._build_system(system_prompt, cached_context)
+            
+            with self.client.messages.stream(
+                model=model or self.model,
+                max_tokens=self.max_tokens,
+                system=system,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ]
+            ) as stream:
+                for text in stream.text_stream:
+                    yield text
+        except Exception as e:
+            logger.error(f"Error communicating with Claude: {str(e)}")
+            raise
+    
+    def _build_system(self, system_prompt: Optional[str] = None,
+                      cached_context: Optional[str] = None) -> Union[str, List[Dict[str, Any]]]:
+        """Build the system parameter for a Messages API request.
+        
+        Args:
+            system_prompt: Optional system prompt to guide Claude's behavior
+            cached_context: Optional shared context to send as a cached system block
+            
+        Returns:
+            The system prompt string, or a list of system blocks when a cached
+            context is given
+        """
+        system = system_prompt or "You are a helpful AI assistant specializing in software development."
+        if not cached_context:
+            return system
+        
+        return [
+            {"type": "text", "text": system},
+            {"type": "text", "text": cached_context, "cache_control": {"type": "ephemeral"}},
+        ]
+    
+    def generate_batch_responses(self, prompts: Dict[str, str], system_prompt: Optional[str] = None,
+                                 cached_context: Optional[str] = None,
+                                 poll_interval: float = 60.0) -> Dict[str, Optional[str]]:
+        """Generate responses for many prompts with the Message Batches API.
+        
+        Batched requests are billed at a reduced rate but may take up to 24 hours
+        to complete, so this is meant for non-interactive workloads. The call
+        blocks, polling every ``poll_interval`` seconds until the batch has ended.
+        
+        Args:
+            prompts: Dictionary mapping caller-defined keys to user prompts
+            system_prompt: Optional system prompt shared by all requests
+            cached_context: Optional shared context to send as a cached system block
+            poll_interval: Seconds to wait between batch status checks
+            
+        Returns:
+            Dictionary mapping each key to Claude's response, or None if the
+            request for that key did not succeed
+        """
+        system = self._build_system(system_prompt, cached_context)
+        
+        # Batch custom IDs are restricted to [a-zA-Z0-9_-], so map keys to indices
+        keys = list(prompts)
+        batch_requests = [
+            {
+                "custom_id": f"request-{index}",
+                "params": {
+                    "model": self.model,
+                    "max_tokens": self.max_tokens,
+                    "system": system,
+                    "messages": [{"role": "user", "content": prompts[key]}],
+                },
+            }
+            for index, key in enumerate(keys)
+        ]
+        
+        try:
+            batch = self.client.messages.batches.create(requests=batch_requests)
+            logger.info(f"Submitted message batch {batch.id} with {len(batch_requests)} requests")
+            
+            while batch.processing_status != "ended":
+                time.sleep(poll_interval)
+                batch = self.client.messages.batches.retrieve(batch.id)
+            
+            responses: Dict[str, Optional[str]] = {key: None for key in keys}
+            for entry in self.client.messages.batches.results(batch.id):
+                key = keys[int(entry.custom_id.rsplit("-", 1)[1])]
+                if entry.result.type == "succeeded":
+                    responses[key] = entry.result.message.content[0].text
+                else:
+                    logger.warning(f"Batch request for {key} did not succeed: {entry.result.type}")
+            
+            return responses
+        except Exception as e:
+            logger.error(f"Error processing message batch with Claude: {str(e)}")
+            raise
+    
     def analyze_with_claude(self, data: str, analysis_type: str) -> Dict[str, Any]:
         """Analyze data using Claude and return structured results.
         
@@ -105,16 +243,170 @@ class AnthropicClient:
         
         return result
     
-    def generate_response(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+    def get_cached_response(self, cache_key: str, model: Optional[str] = None,
+                            json_object: bool = False) -> Optional[str]:
+        """Look up a response cached under a caller-provided key.
+        
+        Lets callers skip building an expensive prompt when a response for
+        the same inputs is already cached. Misses are not counted here, since
+        the caller follows up with generate_response using the same key.
+        
+        Args:
+            cache_key: Key identifying the inputs the prompt is built from
+            model: Optional model to use instead of the configured default
+            json_object: Whether to look up a response cached by
+                generate_json_response rather than generate_response
+            
+        Returns:
+            The cached response, or None if there is none
+        """
+        if self.cache is None:
+            return None
+        
+        response = self.cache.get(self._make_cache_key(model, json_object=json_object, cache_key=cache_key))
+        if response is not None:
+            self._record_cache_hit()
+        return response
+    
+    def generate_response(self, prompt: str, system_prompt: Optional[str] = None,
+                          cached_context: Optional[str] = None, model: Optional[str] = None,
+                          cache_key: Optional[str] = None) -> str:
         """Generate a response from Claude for a given prompt.
         
-        This is an alias for ask_claude for better semantics in some contexts.
+        Like ask_claude, but responses are served from and stored in the
+        response cache when one is configured.
         
         Args:
             prompt: The prompt to send to Claude
             system_prompt: Optional system prompt to guide Claude's behavior
+            cached_context: Optional shared context to send as a cached system block
+            model: Optional model to use instead of the configured default
+            cache_key: Optional key identifying the inputs the prompt was built
+                from, used instead of the prompt itself to key the cache
             
         Returns:
             Claude's response as a string
         """
-        return self.ask_claude(prompt, system_prompt)
+        return self._generate_cached(
+            lambda: self.ask_claude(prompt, system_prompt, cached_context, model),
+            prompt, system_prompt, cached_context, model, cache_key, json_object=False
+        )
+    
+    def generate_json_response(self, prompt: str, system_prompt: Optional[str] = None,
+                               cached_context: Optional[str] = None, model: Optional[str] = None,
+                               cache_key: Optional[str] = None) -> str:
+        """Generate a response from Claude for a prompt asking for a JSON object.
+        
+        The response is streamed and scanned as it arrives, and the stream is
+        closed as soon as the first valid JSON object is complete, so any text
+        Claude adds after the object is neither waited for nor paid for.
+        Responses are cached like those of generate_response, but apart from
+        them, since only the extracted object is kept.
+        
+        Args:
+            prompt: The prompt to send to Claude
+            system_prompt: Optional system prompt to guide Claude's behavior
+            cached_context: Optional shared context to send as a cached system block
+            model: Optional model to use instead of the configured default
+            cache_key: Optional key identifying the inputs the prompt was built
+                from, used instead of the prompt itself to key the cache
+            
+        Returns:
+            The first JSON object in Claude's response, or the whole response
+            if it contains no valid JSON object
+        """
+        def fetch() -> str:
+            scanner = JSONObjectScanner()
+            chunks = []
+            stream = self.stream_claude(prompt, system_prompt, cached_context, model)
+            try:
+                for text in stream:
+                    chunks.append(text)
+                    for candidate in scanner.feed(text):
+                        if parse_json_object(candidate) is not None:
+                            return candidate
+            finally:
+                stream.close()
+            return "".join(chunks)
+        
+        return self._generate_cached(fetch, prompt, system_prompt, cached_context, model, cache_key,
+                                     json_object=True)
+    
+    def _generate_cached(self, fetch: Callable[[], str], prompt: str, system_prompt: Optional[str],
+                         cached_context: Optional[str], model: Optional[str],
+                         cache_key: Optional[str], json_object: bool) -> str:
+        """Serve a request from the response cache, or fetch and cache it.
+        
+        Args:
+            fetch: Function sending the request to Claude
+            prompt: The prompt to send to Claude
+            system_prompt: Optional system prompt to guide Claude's behavior
+            cached_context: Optional shared context to send as a cached system block
+            model: Optional model to use instead of the configured default
+            cache_key: Optional key to use instead of the prompt to key the cache
+            json_object: Whether fetch returns only the first JSON object of
+                the response, which must not be served for a full response
+            
+        Returns:
+            Claude's response as a string
+        """
+        if self.cache is None:
+            return fetch()
+        
+        if cache_key is not None:
+            key = self._make_cache_key(model, json_object=json_object, cache_key=cache_key)
+        else:
+            key = self._make_cache_key(model, json_object=json_object, system_prompt=system_prompt,
+                                       cached_context=cached_context, prompt=prompt)
+        response = self.cache.get(key)
+        if response is not None:
+            self._record_cache_hit()
+            return response
+        
+        def fetch_and_cache() -> str:
+            fetched = fetch()
+            self.cache.set(key, fetched, ttl=self.cache_ttl)
+            return fetched
+        
+        # Identical requests already in flight, possibly from other clients
+        # sharing this cache, are awaited instead of being sent again
+        response, shared = self._in_flight.do(key, fetch_and_cache)
+        if shared:
+            self._record_cache_hit()
+        else:
+            self.cache_stats["misses"] += 1
+        return response
+    
+    def _make_cache_key(self, model: Optional[str], **parts: Any) -> str:
+        """Build a response cache key for a request to the given model.
+        
+        Args:
+            model: Optional model to use instead of the configured default
+            **parts: Other parameters that determine the response
+            
+        Returns:
+            The cache key
+        """
+        return make_cache_key(model=model or self.model, max_tokens=self.max_tokens, **parts)
+    
+    def _record_cache_hit(self) -> None:
+        """Count a response cache hit."""
+        self.cache_stats["hits"] += 1
+        logger.debug(f"Response cache hit ({self.cache_stats['hits']} hits, {self.cache_stats['misses']} misses)")
+
+
+def get_default_client() -> AnthropicClient:
+    """Get the process-wide client configured from the environment.
+    
+    Sharing one client lets every component reuse the same HTTP connection
+    pool instead of opening its own connections to the API.
+    
+    Returns:
+        The shared AnthropicClient, created on first use
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = AnthropicClient(Config())
+    return _default_client
@@ -18,6 +18,7 @@ import requests
 from requests.exceptions import RequestException, Timeout, ConnectionError
 
 from src.utils.logger import setup_logger
+from src.utils.json_utils import dumps_bytes
 
 
 class BaseClient(abc.ABC):
@@ -184,6 +185,9 @@ class BaseClient(abc.ABC):
         """
         Make a POST request with retries and rate limiting.
         
+        A ``json`` payload is encoded once here (with ``orjson`` when available)
+        and the resulting bytes are reused across retry attempts.
+        
         Args:
             url: URL to request
             headers: Optional headers to include in the request
@@ -194,11 +198,40 @@ class BaseClient(abc.ABC):
         Returns:
             Response object from the requests library
         """
+        if json is not None and data is None:
+            return self.post_preencoded(url, dumps_bytes(json), headers=headers, **kwargs)
+        
         self.logger.debug(f"Making POST request to {url}")
         return self._make_request_with_retry(
             requests.post, url, headers=headers, data=data, json=json, **kwargs
         )
     
+    def post_preencoded(self, url: str, body: bytes, 
+                        headers: Optional[Dict[str, str]] = None, 
+                        **kwargs: Any) -> requests.Response:
+        """
+        Make a POST request with an already serialized JSON body.
+        
+        Callers that send the same payload repeatedly can encode it once and
+        pass the bytes here to skip serialization entirely.
+        
+        Args:
+            url: URL to request
+            body: JSON request body as bytes
+            headers: Optional headers to include in the request
+            **kwargs: Additional arguments to pass to requests.post
+            
+        Returns:
+            Response object from the requests library
+        """
+        headers = dict(headers) if headers else {}
+        headers.setdefault("Content-Type", "application/json")
+        
+        self.logger.debug(f"Making POST request to {url}")
+        return self._make_request_with_retry(
+            requests.post, url, headers=headers, data=body, **kwargs
+        )
+    
     def put(self, url: str, headers: Optional[Dict[str, str]] = None, 
             data: Optional[Any] = None, **kwargs: Any) -> requests.Response:
         """
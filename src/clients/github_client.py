@@ -1,6 +1,8 @@
 import os
+import copy
 import logging
-from typing import Dict, List, Optional, Any, Union
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Union, Tuple
 import requests
 from base64 import b64decode
 
@@ -8,6 +10,9 @@ from src.config.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Number of GitHub responses kept for conditional revalidation
+CONDITIONAL_CACHE_SIZE = 256
+
 class Repository:
     """Class representing a GitHub repository."""
     
@@ -49,10 +54,18 @@ class GithubClient:
         
         if config.github_token:
             self.headers["Authorization"] = f"token {config.github_token}"
+        
+        # Validators and bodies of previous responses, keyed by request URL and
+        # params, most recently used kept. GitHub does not count 304 responses
+        # against the rate limit.
+        self._conditional_cache: "OrderedDict[str, Tuple[Optional[str], Optional[str], Any]]" = OrderedDict()
     
     def _make_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Make a request to the GitHub API.
         
+        Previously seen responses are revalidated with ``If-None-Match`` /
+        ``If-Modified-Since``; a ``304 Not Modified`` reply returns the cached body.
+        
         Args:
             endpoint: API endpoint to call
             params: Optional query parameters
@@ -64,9 +77,39 @@ class GithubClient:
             requests.RequestException: If the request fails
         """
         url = f"{self.base_url}/{endpoint}"
-        response = requests.get(url, headers=self.headers, params=params)
+        cache_key = f"{url}?{sorted((params or {}).items())}"
+        cached = self._conditional_cache.get(cache_key)
+        if cached:
+            self._conditional_cache.move_to_end(cache_key)
+        
+        headers = self.headers
+        if cached:
+            etag, last_modified, _ = cached
+            headers = dict(self.headers)
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        
+        response = requests.get(url, headers=headers, params=params)
+        if cached and response.status_code == 304:
+            logger.debug(f"GitHub resource not modified, using cached response: {url}")
+            # Cached bodies are private copies, so callers modifying a result
+            # never alter the cache
+            return copy.deepcopy(cached[2])
+        
         response.raise_for_status()
-        return response.json()
+        data = response.json()
+        
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._conditional_cache[cache_key] = (etag, last_modified, copy.deepcopy(data))
+            self._conditional_cache.move_to_end(cache_key)
+            while len(self._conditional_cache) > CONDITIONAL_CACHE_SIZE:
+                self._conditional_cache.popitem(last=False)
+        
+        return data
     
     def search_repositories(self, query: str, sort: str = "stars", order: str = "desc", per_page: int = 10) -> List[Repository]:
         """Search for repositories on GitHub.
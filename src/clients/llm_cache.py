@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LLM Cache Module.
+
+This module provides caches for Claude responses. Prompts built by the Project
+Architect are deterministic functions of the project being generated, so
+repeating a generation (retries, pipeline reruns, tests) can reuse earlier
+responses instead of paying for the same request again.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence, Tuple, TypeVar
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+# Default location of the on-disk response cache
+DEFAULT_DISK_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "project_architect", "llm.sqlite")
+
+# Default number of responses kept by the in-memory cache
+DEFAULT_MAX_ENTRIES = 256
+
+# Embedding model used by the semantic cache when none is given
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Minimum cosine similarity for the semantic cache to treat texts as equivalent
+DEFAULT_SIMILARITY_THRESHOLD = 0.92
+
+T = TypeVar("T")
+
+
+def make_cache_key(**parts: Any) -> str:
+    """Build a cache key from the parameters that determine a response.
+
+    Args:
+        **parts: Request parameters such as model, prompt and temperature
+
+    Returns:
+        Hex-encoded SHA-256 digest of the parameters
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CacheBackend(Protocol):
+    """Interface of response cache backends."""
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response, or None if missing or expired."""
+        ...
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """Store a response, optionally expiring after ttl seconds."""
+        ...
+
+    def delete(self, key: str) -> None:
+        """Remove a cached response."""
+        ...
+
+
+class InMemoryLRUCache:
+    """Thread-safe in-memory cache keeping the most recently used responses."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of responses to keep
+        """
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Tuple[str, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached response, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """Store a response, evicting the least recently used ones if full.
+
+        Args:
+            key: Cache key
+            value: Response to cache
+            ttl: Optional time to live in seconds
+        """
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Remove a cached response.
+
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class DiskCache:
+    """Response cache persisted in a SQLite database."""
+
+    def __init__(self, path: str = DEFAULT_DISK_CACHE_PATH):
+        """Initialize the cache, creating the database if needed.
+
+        Args:
+            path: Path of the SQLite database file
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL, ttl REAL)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached response, or None if missing or expired
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT response, created, ttl FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        response, created, ttl = row
+        if ttl is not None and created + ttl <= time.time():
+            self.delete(key)
+            return None
+        return response
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """Store a response.
+
+        Args:
+            key: Cache key
+            value: Response to cache
+            ttl: Optional time to live in seconds
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created, ttl) VALUES (?, ?, ?, ?)",
+                (key, value, time.time(), ttl)
+            )
+
+    def delete(self, key: str) -> None:
+        """Remove a cached response.
+
+        Args:
+            key: Cache key
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+class SingleFlight:
+    """Lets concurrent callers with the same key share a single call.
+
+    The first caller for a key runs the call; callers arriving while it is
+    in flight wait for its result instead of repeating the call.
+    """
+
+    def __init__(self):
+        """Initialize an empty table of in-flight calls."""
+        self._calls: Dict[str, "Future[Any]"] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """Run a call, or wait for an identical one already in flight.
+
+        Args:
+            key: Key identifying the call
+            fn: Function performing the call
+
+        Returns:
+            Tuple of the call's result and whether it was shared with
+            another caller
+
+        Raises:
+            Exception: Whatever the call raised, for every waiting caller
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class SemanticCache:
+    """Cache matching free-form texts by meaning rather than exact wording.
+
+    Descriptions written by users rarely repeat word for word, so exact-text
+    keys almost never hit. Texts are embedded instead, and a cached response
+    is reused when the most similar earlier text in the same namespace is at
+    least as similar as the threshold. Requires numpy, and
+    sentence-transformers unless an embedding function is given.
+    """
+
+    def __init__(self, embed: Optional[Callable[[str], Sequence[float]]] = None,
+                 threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Initialize the cache.
+
+        Args:
+            embed: Optional function mapping a text to its embedding; defaults
+                to a local sentence-transformers model
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Maximum number of responses kept per namespace
+
+        Raises:
+            ImportError: If numpy, or sentence-transformers when no embedding
+                function is given, is not installed
+        """
+        if np is None:
+            raise ImportError("SemanticCache requires numpy; install project-architect[semantic-cache]")
+        if embed is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError as e:
+                raise ImportError(
+                    "SemanticCache requires sentence-transformers unless an embedding function is given; "
+                    "install project-architect[semantic-cache]"
+                ) from e
+            embed = SentenceTransformer(DEFAULT_EMBEDDING_MODEL).encode
+
+        self.embed = embed
+        self.threshold = threshold
+        self.max_entries = max(1, max_entries)
+        # Per namespace, a matrix of L2-normalized embeddings, one row per
+        # response, and the responses in the same order
+        self._entries: Dict[str, Tuple["np.ndarray", List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, namespace: str, text: str, compute: Callable[[], str]) -> str:
+        """Get the response cached for a similar text, or compute and cache it.
+
+        Args:
+            namespace: Kind of request, so different questions about the same
+                text do not share responses
+            text: The text the request is about
+            compute: Function computing the response on a miss
+
+        Returns:
+            The cached or computed response
+        """
+        query = np.asarray(self.embed(text), dtype=np.float32).ravel()
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        with self._lock:
+            embeddings, responses = self._entries.get(namespace, (None, []))
+            if embeddings is not None:
+                similarities = embeddings @ query
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    return responses[best]
+
+        response = compute()
+
+        with self._lock:
+            embeddings, responses = self._entries.get(namespace, (None, []))
+            if embeddings is None:
+                embeddings = query[np.newaxis, :]
+            else:
+                embeddings = np.vstack([embeddings, query])
+            responses = responses + [response]
+            self._entries[namespace] = (embeddings[-self.max_entries:], responses[-self.max_entries:])
+        return response
@@ -16,6 +16,7 @@ class Config:
         self.config: Dict[str, Any] = {}
         self.anthropic_api_key: Optional[str] = None
         self.anthropic_model: Optional[str] = None
+        self.anthropic_fast_model: Optional[str] = None
         self.anthropic_max_tokens: Optional[int] = None
         self.github_token: Optional[str] = None
         self._load_from_env()
@@ -46,6 +47,7 @@ class Config:
             if not self.anthropic_api_key and 'clients' in self.config and 'anthropic' in self.config['clients']:
                 self.anthropic_api_key = self.config['clients']['anthropic'].get('api_key')
                 self.anthropic_model = self.config['clients']['anthropic'].get('model')
+                self.anthropic_fast_model = self.config['clients']['anthropic'].get('fast_model')
                 self.anthropic_max_tokens = self.config['clients']['anthropic'].get('max_tokens')
             
             if not self.github_token and 'clients' in self.config and 'github' in self.config['clients']:
@@ -64,6 +66,7 @@ class Config:
         # Anthropic API configuration
         self.anthropic_api_key = os.environ.get('ANTHROPIC_API_KEY')
         self.anthropic_model = os.environ.get('ANTHROPIC_MODEL')
+        self.anthropic_fast_model = os.environ.get('ANTHROPIC_FAST_MODEL')
         if 'ANTHROPIC_MAX_TOKENS' in os.environ:
             try:
                 self.anthropic_max_tokens = int(os.environ.get('ANTHROPIC_MAX_TOKENS', '4000'))
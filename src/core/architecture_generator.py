@@ -28,19 +28,25 @@ class ArchitectureGenerator:
     for software projects, including components, dependencies, and data flows.
     """
 
-    def __init__(self, api_key: Optional[str] = None) -> None:
+    def __init__(self, api_key: Optional[str] = None,
+                 anthropic_client: Optional[AnthropicClient] = None) -> None:
         """Initialize the ArchitectureGenerator with an Anthropic client.
         
         Args:
             api_key: Optional Anthropic API key. If not provided, will attempt
                     to use the ANTHROPIC_API_KEY environment variable.
+            anthropic_client: Optional pre-built client to use instead of
+                    creating one, such as one sharing a response cache with
+                    the other pipeline stages; api_key is then ignored.
         """
-        # Create a Config object and set the API key if provided
-        config = Config()
-        if api_key:
-            config.anthropic_api_key = api_key
+        if anthropic_client is None:
+            # Create a Config object and set the API key if provided
+            config = Config()
+            if api_key:
+                config.anthropic_api_key = api_key
+            anthropic_client = AnthropicClient(config)
             
-        self.anthropic_client = AnthropicClient(config)
+        self.anthropic_client = anthropic_client
         self.logger = logging.getLogger(__name__)
 
     def generate_architecture(self, project_type: ProjectType, requirements: List[str]) -> ArchitecturePlan:
@@ -1,12 +1,241 @@
 import logging
-import json
-from typing import Dict, List, Any, Optional, Union
+import os
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from string import Template
+from typing import Dict, Iterator, List, Any, Optional, Pattern, Tuple, Union
 
 from src.models.architecture_plan import ArchitecturePlan
 from src.models.project_structure import ProjectStructure
 from src.models.code_file import CodeFile
 from src.clients.anthropic_client import AnthropicClient
+from src.clients.llm_cache import CacheBackend, DiskCache, InMemoryLRUCache
 from src.config.config import Config
+from src.utils import json_utils
+
+
+CODE_SYSTEM_PROMPT = (
+    "You are an expert software developer. You generate the code for individual files "
+    "of the project described below. Provide ONLY the code for the requested file, "
+    "no explanations. Write clean, well-documented, high-quality code following best "
+    "practices for the file's programming language."
+)
+
+# Rest of a code fence's opening line: an optional info string such as
+# python or tsx
+CODE_FENCE_HEADER_PATTERN: Pattern[str] = re.compile(r"[\w+#.-]*[ \t]*\r?")
+
+# Matches the first fenced code block and captures its body
+CODE_BLOCK_PATTERN: Pattern[str] = re.compile(
+    r"```" + CODE_FENCE_HEADER_PATTERN.pattern + r"\n(.*?)```", re.DOTALL
+)
+
+# Programming language for each (lowercase) file extension
+EXTENSION_LANGUAGES: Dict[str, str] = {
+    "py": "python",
+    "js": "javascript",
+    "jsx": "javascript",
+    "ts": "typescript",
+    "tsx": "typescript",
+    "html": "html",
+    "css": "css",
+    "scss": "css",
+    "sass": "css",
+    "json": "json",
+    "md": "markdown",
+    "yml": "yaml",
+    "yaml": "yaml",
+    "sql": "sql",
+    "sh": "bash",
+    "bash": "bash",
+    "dockerfile": "dockerfile",
+    "java": "java",
+    "kt": "kotlin",
+    "rb": "ruby",
+    "php": "php",
+    "c": "c",
+    "cpp": "cpp",
+    "cs": "csharp",
+    "go": "go",
+    "rs": "rust",
+    "swift": "swift",
+    "txt": "text",
+    "xml": "xml",
+    "ini": "ini",
+    "cfg": "ini",
+    "conf": "ini",
+    "env": "env",
+}
+
+# Maximum number of concurrent Claude requests while generating files
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+
+# Minimum number of similar files generated from a single shared template
+DEFAULT_MIN_TEMPLATE_CLUSTER_SIZE = 3
+
+# Maximum length of a related file's description quoted in a file prompt
+RELATED_FILE_DESCRIPTION_LIMIT = 120
+
+# Files in these languages are always generated with the fast model
+FAST_MODEL_LANGUAGES = frozenset(["markdown", "text", "env", "ini"])
+
+# Files without components whose prompt is shorter than this (in estimated
+# tokens) are generated with the fast model
+FAST_MODEL_MAX_PROMPT_TOKENS = 800
+
+# .gitignore contents rendered locally, by project language family
+GITIGNORE_TEMPLATES = {
+    "python": "\n".join([
+        "__pycache__/",
+        "*.py[cod]",
+        "*.egg-info/",
+        ".eggs/",
+        "build/",
+        "dist/",
+        ".venv/",
+        "venv/",
+        ".env",
+        ".pytest_cache/",
+        ".mypy_cache/",
+        ".coverage",
+        "htmlcov/",
+        ".idea/",
+        ".vscode/",
+        "",
+    ]),
+    "javascript": "\n".join([
+        "node_modules/",
+        "dist/",
+        "build/",
+        "coverage/",
+        ".env",
+        ".env.local",
+        "npm-debug.log*",
+        "yarn-debug.log*",
+        "yarn-error.log*",
+        ".DS_Store",
+        ".idea/",
+        ".vscode/",
+        "",
+    ]),
+}
+
+# Project type keywords identifying each language family
+PROJECT_FAMILY_KEYWORDS = {
+    "python": ("python", "django", "flask", "fastapi"),
+    "javascript": ("javascript", "typescript", "react", "node", "vue", "angular", "next"),
+}
+
+# Number of Claude responses kept in the in-memory response cache
+DEFAULT_RESPONSE_CACHE_SIZE = 256
+
+# Name of the response cache database created in a cache_dir
+RESPONSE_CACHE_FILENAME = "code_responses.sqlite"
+
+
+class StreamingCodeExtractor:
+    """
+    Incrementally extracts the first fenced code block from streamed text.
+    
+    Produces the same result as CodeGenerator._extract_code_from_response,
+    but hands out code as soon as it is known to be inside the block. The
+    only difference is a block that is never closed, which is returned up
+    to the end of the stream instead of falling back to the full response.
+    """
+    
+    def __init__(self):
+        """Initialize the extractor."""
+        self._response = ""
+        self._pending = ""
+        self._in_block = False
+        self._done = False
+        self._started = False
+    
+    def feed(self, text: str) -> str:
+        """
+        Add a chunk of the response.
+        
+        Args:
+            text: The next chunk of response text
+            
+        Returns:
+            The code that can be emitted so far (possibly empty)
+        """
+        if self._done:
+            return ""
+        
+        self._pending += text
+        if not self._in_block:
+            # Kept for the no-code-block fallback in finish()
+            self._response += text
+            if not self._find_block_start():
+                return ""
+        
+        end = self._pending.find("```")
+        if end != -1:
+            code = self._pending[:end].rstrip()
+            self._pending = ""
+            self._done = True
+        else:
+            # Hold back trailing whitespace (stripped at the end) and
+            # backticks (possibly the start of the closing fence)
+            code = self._pending
+            while code != code.rstrip().rstrip("`"):
+                code = code.rstrip().rstrip("`")
+            self._pending = self._pending[len(code):]
+        
+        return self._start(code)
+    
+    def finish(self) -> str:
+        """
+        Signal the end of the response.
+        
+        Returns:
+            The remaining code, or the whole stripped response if it did not
+            contain a code block
+        """
+        if self._done:
+            return ""
+        
+        self._done = True
+        if not self._in_block:
+            return self._response.strip()
+        return self._start(self._pending.rstrip())
+    
+    def _find_block_start(self) -> bool:
+        """
+        Look for an opening code fence in the pending text.
+        
+        Returns:
+            True if the pending text now starts inside a code block
+        """
+        while True:
+            start = self._pending.find("```")
+            if start == -1:
+                # Keep a possible partial fence for the next chunk
+                self._pending = self._pending[-2:]
+                return False
+            
+            newline = self._pending.find("\n", start + 3)
+            if newline == -1:
+                self._pending = self._pending[start:]
+                return False
+            
+            if CODE_FENCE_HEADER_PATTERN.fullmatch(self._pending, start + 3, newline):
+                self._pending = self._pending[newline + 1:]
+                self._in_block = True
+                return True
+            
+            self._pending = self._pending[start + 1:]
+    
+    def _start(self, code: str) -> str:
+        """Strip leading whitespace until the first code is emitted."""
+        if not self._started:
+            code = code.lstrip()
+            self._started = bool(code)
+        return code
 
 
 class CodeGenerator:
@@ -17,25 +246,82 @@ class CodeGenerator:
     the project structure and architecture plan.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None,
+                 max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+                 use_file_templates: bool = False,
+                 min_template_cluster_size: int = DEFAULT_MIN_TEMPLATE_CLUSTER_SIZE,
+                 use_cache: bool = True,
+                 cache_dir: Optional[str] = None,
+                 use_fast_model: bool = False,
+                 include_related_files: bool = False,
+                 cache: Optional[CacheBackend] = None,
+                 anthropic_client: Optional[AnthropicClient] = None):
         """
         Initialize the CodeGenerator.
         
         Args:
             api_key: Optional Anthropic API key. If not provided, will use
                     the ANTHROPIC_API_KEY environment variable.
+            max_concurrent_requests: Maximum number of files generated in
+                    parallel. Keep within the account's rate limits.
+            use_file_templates: Whether to generate clusters of similar files
+                    (e.g. every package's __init__.py) from one shared template
+                    instead of one request per file.
+            min_template_cluster_size: Minimum number of similar files for a
+                    cluster to be generated from a template.
+            use_cache: Whether to reuse Claude's response for identical prompts.
+            cache_dir: Optional directory to persist cached responses in, so
+                    that re-running the same project does not repeat requests.
+            use_fast_model: Whether to generate simple files (documentation,
+                    configuration, small files without components) with the
+                    configured fast model instead of the default model.
+                    Off by default, since it trades output quality for speed.
+            include_related_files: Whether to list the other files implementing
+                    a file's components in its prompt. Adds input tokens to
+                    every prompt of a file with components.
+            cache: Optional cache for Claude responses; defaults to a disk
+                    cache in cache_dir, or an in-memory one, when use_cache
+                    is set.
+            anthropic_client: Optional pre-built client to use instead of
+                    creating one; api_key and the cache options are then
+                    ignored.
         """
         # Create a Config object and set the API key if provided
         config = Config()
         if api_key:
             config.anthropic_api_key = api_key
             
-        self.anthropic_client = AnthropicClient(config)
+        self._config = config
+        self.max_concurrent_requests = max(1, max_concurrent_requests)
+        self.use_file_templates = use_file_templates
+        self.min_template_cluster_size = max(2, min_template_cluster_size)
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir
+        self.use_fast_model = use_fast_model
+        self.include_related_files = include_related_files
+        self._cache = cache
+        self._anthropic_client = anthropic_client
         self.logger = logging.getLogger(__name__)
     
+    @cached_property
+    def anthropic_client(self) -> AnthropicClient:
+        """The Anthropic client, created on first use."""
+        if self._anthropic_client is not None:
+            return self._anthropic_client
+        
+        cache = self._cache
+        if cache is None and self.use_cache:
+            if self.cache_dir:
+                cache = DiskCache(os.path.join(self.cache_dir, RESPONSE_CACHE_FILENAME))
+            else:
+                cache = InMemoryLRUCache(max_entries=DEFAULT_RESPONSE_CACHE_SIZE)
+        return AnthropicClient(self._config, cache=cache)
+    
     def generate_code(self, project_structure: ProjectStructure, 
                      architecture_plan: ArchitecturePlan,
-                     additional_context: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+                     additional_context: Optional[Dict[str, Any]] = None,
+                     batch: bool = False,
+                     existing_files: Optional[Dict[str, str]] = None) -> Dict[str, str]:
         """
         Generate code for all files in the project structure.
         
@@ -43,49 +329,477 @@ class CodeGenerator:
             project_structure: The project structure
             architecture_plan: The architecture plan
             additional_context: Additional context for code generation
+            batch: Whether to submit all files as one message batch (cheaper,
+                   but may take hours) instead of individual requests
+            existing_files: Contents already produced elsewhere (e.g. dependency
+                   files), used as-is instead of asking Claude
             
         Returns:
             Dictionary mapping file paths to code content
         """
+        if batch:
+            return self.generate_code_batch(
+                project_structure, architecture_plan, additional_context, existing_files=existing_files
+            )
+        
         self.logger.info("Generating code files")
         
-        code_files = {}
+        # Components are serialized once and shared by all prompts
+        components_by_name = self._build_components_by_name(architecture_plan)
+        
+        # Shared by every file of the project and sent as a cached prompt prefix
+        project_context = self._build_project_context(
+            project_structure, architecture_plan, components_by_name, additional_context
+        )
+        
+        # Skip files without paths
+        files = [file_info for file_info in project_structure.files if file_info.get("path")]
+        component_index = self._build_component_index(files)
+        local_files = self._render_local_files(files, project_structure, existing_files)
+        
+        def generate(file_info: Dict[str, Any]) -> str:
+            return self._generate_file_entry(
+                file_info=file_info,
+                project_structure=project_structure,
+                architecture_plan=architecture_plan,
+                additional_context=additional_context,
+                project_context=project_context,
+                component_index=component_index,
+                components_by_name=components_by_name
+            )
+        
+        def generate_group(group: List[Dict[str, Any]]) -> Dict[str, str]:
+            if len(group) > 1:
+                templated = self._generate_cluster_from_template(
+                    cluster=group,
+                    architecture_plan=architecture_plan,
+                    project_context=project_context,
+                    components_by_name=components_by_name
+                )
+                if templated is not None:
+                    return templated
+            return {file_info["path"]: generate(file_info) for file_info in group}
+        
+        groups = self._group_files([
+            file_info for file_info in files if file_info["path"] not in local_files
+        ])
+        
+        # Create the client before fanning out; cached_property is not locked
+        # on every Python version, so workers could otherwise each create one
+        # with its own response cache
+        self.anthropic_client
+        
+        # Claude calls are network-bound, so overlap them in a bounded thread pool
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_requests) as executor:
+            generated: Dict[str, str] = dict(local_files)
+            for group_files in executor.map(generate_group, groups):
+                generated.update(group_files)
+        
+        # Keep the order of the project structure
+        code_files = {file_info["path"]: generated[file_info["path"]] for file_info in files}
+        
+        self.logger.info(f"Generated {len(code_files)} code files")
+        return code_files
+    
+    def generate_code_batch(self, project_structure: ProjectStructure,
+                            architecture_plan: ArchitecturePlan,
+                            additional_context: Optional[Dict[str, Any]] = None,
+                            poll_interval: float = 60.0,
+                            existing_files: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Generate code for all files in a single Message Batches submission.
+        
+        Batches cost half as much as individual requests but can take up to
+        24 hours to finish, so this is intended for offline generation.
         
-        for file_info in project_structure.files:
-            file_path = file_info.get("path", "")
+        Args:
+            project_structure: The project structure
+            architecture_plan: The architecture plan
+            additional_context: Additional context for code generation
+            poll_interval: Seconds to wait between batch status checks
+            existing_files: Contents already produced elsewhere, used as-is
+            
+        Returns:
+            Dictionary mapping file paths to code content
+        """
+        self.logger.info("Generating code files with a message batch")
+        
+        components_by_name = self._build_components_by_name(architecture_plan)
+        project_context = self._build_project_context(
+            project_structure, architecture_plan, components_by_name, additional_context
+        )
+        files = [file_info for file_info in project_structure.files if file_info.get("path")]
+        component_index = self._build_component_index(files)
+        local_files = self._render_local_files(files, project_structure, existing_files)
+        
+        prompts = {}
+        for file_info in files:
+            file_path = file_info["path"]
+            if file_path in local_files:
+                continue
+            prompts[file_path] = self._create_code_prompt(
+                file_path=file_path,
+                file_description=file_info.get("description", ""),
+                file_components=file_info.get("components", []),
+                language=self._get_file_language(file_path),
+                architecture_plan=architecture_plan,
+                component_index=component_index,
+                components_by_name=components_by_name
+            )
+        
+        responses = self.anthropic_client.generate_batch_responses(
+            prompts,
+            system_prompt=CODE_SYSTEM_PROMPT,
+            cached_context=project_context,
+            poll_interval=poll_interval
+        )
+        
+        generated = dict(local_files)
+        for file_path, response in responses.items():
+            if response is None:
+                self.logger.error(f"Error generating code for {file_path}: batch request failed")
+                generated[file_path] = f"# Error generating code: batch request failed\n# File: {file_path}"
+            else:
+                generated[file_path] = self._extract_code_from_response(response)
+        
+        # Keep the order of the project structure
+        code_files = {file_info["path"]: generated[file_info["path"]] for file_info in files}
+        
+        self.logger.info(f"Generated {len(code_files)} code files")
+        return code_files
+    
+    def generate_code_streaming(self, project_structure: ProjectStructure,
+                                architecture_plan: ArchitecturePlan,
+                                additional_context: Optional[Dict[str, Any]] = None,
+                                existing_files: Optional[Dict[str, str]] = None) -> Iterator[Tuple[str, str]]:
+        """
+        Generate code file by file, yielding code as Claude streams it.
+        
+        Lets callers start writing a file before its response is complete.
+        Files are generated one after another; all chunks of a file are
+        yielded before the next file starts, and every file yields at least
+        one (possibly empty) chunk.
+        
+        Args:
+            project_structure: The project structure
+            architecture_plan: The architecture plan
+            additional_context: Additional context for code generation
+            existing_files: Contents already produced elsewhere, used as-is
+            
+        Yields:
+            Tuples of (file path, code chunk)
+        """
+        self.logger.info("Streaming code files")
+        
+        components_by_name = self._build_components_by_name(architecture_plan)
+        project_context = self._build_project_context(
+            project_structure, architecture_plan, components_by_name, additional_context
+        )
+        files = [file_info for file_info in project_structure.files if file_info.get("path")]
+        component_index = self._build_component_index(files)
+        local_files = self._render_local_files(files, project_structure, existing_files)
+        
+        for file_info in files:
+            file_path = file_info["path"]
             file_description = file_info.get("description", "")
-            file_components = file_info.get("components", [])
             
-            # Skip files without paths
-            if not file_path:
+            if file_path in local_files:
+                yield file_path, local_files[file_path]
                 continue
             
             self.logger.debug(f"Generating code for {file_path}")
             
-            # Generate code for the file
+            extractor = StreamingCodeExtractor()
             try:
-                code = self._generate_file_code(
+                prompt = self._create_code_prompt(
                     file_path=file_path,
                     file_description=file_description,
-                    file_components=file_components,
-                    project_structure=project_structure,
+                    file_components=file_info.get("components", []),
+                    language=self._get_file_language(file_path),
                     architecture_plan=architecture_plan,
-                    additional_context=additional_context
+                    component_index=component_index,
+                    components_by_name=components_by_name
                 )
                 
-                code_files[file_path] = code
+                for text in self.anthropic_client.stream_claude(
+                    prompt,
+                    system_prompt=CODE_SYSTEM_PROMPT,
+                    cached_context=project_context
+                ):
+                    code = extractor.feed(text)
+                    if code:
+                        yield file_path, code
+                
+                yield file_path, extractor.finish()
             except Exception as e:
                 self.logger.error(f"Error generating code for {file_path}: {e}")
-                # Provide a placeholder for files that couldn't be generated
-                code_files[file_path] = f"# Error generating code: {e}\n# File: {file_path}\n# Description: {file_description}"
+                # Code already yielded for this file is followed by the placeholder
+                yield file_path, f"\n# Error generating code: {e}\n# File: {file_path}\n# Description: {file_description}"
+    
+    def _render_local_files(self, files: List[Dict[str, Any]], project_structure: ProjectStructure,
+                            existing_files: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Produce the files that do not need Claude.
         
-        self.logger.info(f"Generated {len(code_files)} code files")
+        Args:
+            files: File descriptors from the project structure
+            project_structure: The project structure
+            existing_files: Contents already produced elsewhere
+            
+        Returns:
+            Dictionary mapping file paths to content for the files handled locally
+        """
+        existing_files = existing_files or {}
+        local_files = {}
+        for file_info in files:
+            file_path = file_info["path"]
+            if file_path in existing_files:
+                local_files[file_path] = existing_files[file_path]
+                continue
+            
+            content = self._render_trivial_file(
+                file_path, file_info.get("components", []), project_structure.project_type
+            )
+            if content is not None:
+                local_files[file_path] = content
+        
+        if local_files:
+            self.logger.info(f"Rendered {len(local_files)} files locally without calling Claude")
+        return local_files
+    
+    def _render_trivial_file(self, file_path: str, file_components: List[str],
+                             project_type: Any) -> Optional[str]:
+        """
+        Render a near-deterministic file from a local template.
+        
+        Args:
+            file_path: Path to the file
+            file_components: Components implemented in the file
+            project_type: The project type of the project structure
+            
+        Returns:
+            The file content, or None if the file needs to be generated
+        """
+        file_name = os.path.basename(file_path)
+        
+        if file_name == "__init__.py" and not file_components:
+            package = os.path.basename(os.path.dirname(file_path))
+            return f'"""{package} package."""\n' if package else ""
+        
+        if file_name == ".gitignore":
+            project_type_name = str(project_type).lower()
+            for family, keywords in PROJECT_FAMILY_KEYWORDS.items():
+                if any(keyword in project_type_name for keyword in keywords):
+                    return GITIGNORE_TEMPLATES[family]
+        
+        return None
+    
+    def _group_files(self, files: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Split files into generation units.
+        
+        Every file is its own unit unless file templates are enabled, in which
+        case large enough clusters of similar files form a single unit.
+        
+        Args:
+            files: File descriptors from the project structure
+            
+        Returns:
+            List of file groups
+        """
+        if not self.use_file_templates:
+            return [[file_info] for file_info in files]
+        
+        groups = []
+        for cluster in self._cluster_files(files).values():
+            if len(cluster) >= self.min_template_cluster_size:
+                groups.append(cluster)
+            else:
+                groups.extend([file_info] for file_info in cluster)
+        return groups
+    
+    def _cluster_files(self, files: List[Dict[str, Any]]) -> Dict[Tuple[str, Tuple[str, ...]], List[Dict[str, Any]]]:
+        """
+        Cluster structurally similar files.
+        
+        Files are similar when they share a file name (such as __init__.py or
+        index.js) and implement the same set of components.
+        
+        Args:
+            files: File descriptors from the project structure
+            
+        Returns:
+            Dictionary mapping cluster keys to the files of each cluster
+        """
+        clusters: Dict[Tuple[str, Tuple[str, ...]], List[Dict[str, Any]]] = defaultdict(list)
+        for file_info in files:
+            file_name = os.path.basename(file_info["path"])
+            components = tuple(sorted(set(file_info.get("components", []))))
+            clusters[(file_name, components)].append(file_info)
+        return dict(clusters)
+    
+    def _generate_cluster_from_template(self, cluster: List[Dict[str, Any]],
+                                        architecture_plan: ArchitecturePlan,
+                                        project_context: str,
+                                        components_by_name: Optional[Dict[str, Dict[str, Any]]] = None) -> Optional[Dict[str, str]]:
+        """
+        Generate a cluster of similar files from one shared template.
+        
+        Claude is asked once for a string.Template covering the whole cluster,
+        which is then rendered locally for each file.
+        
+        Args:
+            cluster: Similar file descriptors from _cluster_files
+            architecture_plan: The architecture plan
+            project_context: Pre-built project context from _build_project_context
+            components_by_name: Pre-built lookup from _build_components_by_name
+            
+        Returns:
+            Dictionary mapping file paths to code content, or None if no
+            usable template could be generated
+        """
+        first_path = cluster[0]["path"]
+        language = self._get_file_language(first_path)
+        
+        prompt = self._create_code_prompt(
+            file_path=first_path,
+            file_description=cluster[0].get("description", ""),
+            file_components=cluster[0].get("components", []),
+            language=language,
+            architecture_plan=architecture_plan,
+            components_by_name=components_by_name
+        )
+        prompt += f"""
+        
+        The same kind of file is needed at each of these paths:
+        {json_utils.dumps([file_info["path"] for file_info in cluster], indent=2)}
+        
+        Write ONE template that works for all of them, using Python string.Template
+        placeholders: $path (file path), $name (file name without extension),
+        $package (name of the containing directory) and $module (dotted module path).
+        Write any literal dollar sign as $$.
+        """
+        
+        try:
+            response = self._generate_response(prompt, project_context)
+            template = Template(self._extract_code_from_response(response))
+            
+            code_files = {}
+            for file_info in cluster:
+                file_path = file_info["path"]
+                module_path = os.path.splitext(file_path)[0]
+                if os.path.basename(module_path) == "__init__":
+                    module_path = os.path.dirname(module_path)
+                code_files[file_path] = template.substitute(
+                    path=file_path,
+                    name=os.path.splitext(os.path.basename(file_path))[0],
+                    package=os.path.basename(os.path.dirname(file_path)),
+                    module=module_path.replace("/", ".")
+                )
+        except (KeyError, ValueError) as e:
+            self.logger.warning(f"Unusable template for {len(cluster)} files like {first_path}: {e}")
+            return None
+        except Exception as e:
+            self.logger.warning(f"Error generating template for files like {first_path}: {e}")
+            return None
+        
+        self.logger.debug(f"Generated {len(cluster)} files like {first_path} from one template")
         return code_files
     
+    def _generate_file_entry(self, file_info: Dict[str, Any],
+                             project_structure: ProjectStructure,
+                             architecture_plan: ArchitecturePlan,
+                             additional_context: Optional[Dict[str, Any]],
+                             project_context: str,
+                             component_index: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                             components_by_name: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+        """
+        Generate code for one entry of the project structure's file list.
+        
+        Errors are logged and turned into a placeholder so that one failing
+        file does not abort the whole generation run.
+        
+        Args:
+            file_info: File descriptor from the project structure
+            project_structure: The project structure
+            architecture_plan: The architecture plan
+            additional_context: Additional context for code generation
+            project_context: Pre-built project context from _build_project_context
+            component_index: Pre-built index from _build_component_index
+            components_by_name: Pre-built lookup from _build_components_by_name
+            
+        Returns:
+            The generated code, or a placeholder if generation failed
+        """
+        file_path = file_info.get("path", "")
+        file_description = file_info.get("description", "")
+        file_components = file_info.get("components", [])
+        
+        self.logger.debug(f"Generating code for {file_path}")
+        
+        try:
+            return self._generate_file_code(
+                file_path=file_path,
+                file_description=file_description,
+                file_components=file_components,
+                project_structure=project_structure,
+                architecture_plan=architecture_plan,
+                additional_context=additional_context,
+                project_context=project_context,
+                component_index=component_index,
+                components_by_name=components_by_name
+            )
+        except Exception as e:
+            self.logger.error(f"Error generating code for {file_path}: {e}")
+            # Provide a placeholder for files that couldn't be generated
+            return f"# Error generating code: {e}\n# File: {file_path}\n# Description: {file_description}"
+    
+    def _build_project_context(self, project_structure: ProjectStructure,
+                               architecture_plan: ArchitecturePlan,
+                               components_by_name: Optional[Dict[str, Dict[str, Any]]] = None,
+                               additional_context: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build the project-wide context shared by all file generation prompts.
+        
+        Everything that is the same for every file belongs here rather than in
+        the per-file prompt, since only this prefix is cached.
+        
+        Args:
+            project_structure: The project structure
+            architecture_plan: The architecture plan
+            components_by_name: Pre-built lookup from _build_components_by_name
+            additional_context: Additional context for code generation
+            
+        Returns:
+            The project context as a string
+        """
+        if components_by_name is None:
+            components_by_name = self._build_components_by_name(architecture_plan)
+        components = list(components_by_name.values())
+        
+        context = f"""
+        Project Type: {project_structure.project_type}
+        Project Description: {project_structure.description}
+        
+        Architecture Components:
+        {json_utils.dumps(components, indent=2)}
+        
+        Project Structure:
+        Directories: {json_utils.dumps(project_structure.directories, indent=2)}
+        """
+        
+        if additional_context:
+            context += f"\n\nAdditional Context:\n{json_utils.dumps(additional_context, indent=2)}"
+        
+        return context
+    
     def _generate_file_code(self, file_path: str, file_description: str, 
                            file_components: List[str], project_structure: ProjectStructure,
                            architecture_plan: ArchitecturePlan,
-                           additional_context: Optional[Dict[str, Any]] = None) -> str:
+                           additional_context: Optional[Dict[str, Any]] = None,
+                           project_context: Optional[str] = None,
+                           component_index: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                           components_by_name: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
         """
         Generate code for a single file.
         
@@ -96,88 +810,243 @@ class CodeGenerator:
             project_structure: The project structure
             architecture_plan: The architecture plan
             additional_context: Additional context for code generation
+            project_context: Pre-built project context from _build_project_context
+            component_index: Pre-built index from _build_component_index
+            components_by_name: Pre-built lookup from _build_components_by_name
             
         Returns:
             The generated code as a string
         """
-        # Determine the programming language based on file extension
-        extension = file_path.split(".")[-1] if "." in file_path else ""
-        language = self._get_language_from_extension(extension)
+        if components_by_name is None:
+            components_by_name = self._build_components_by_name(architecture_plan)
+        if project_context is None:
+            project_context = self._build_project_context(
+                project_structure, architecture_plan, components_by_name, additional_context
+            )
+        if component_index is None:
+            component_index = self._build_component_index(project_structure.files)
+        
+        language = self._get_file_language(file_path)
+        prompt = self._create_code_prompt(
+            file_path=file_path,
+            file_description=file_description,
+            file_components=file_components,
+            language=language,
+            architecture_plan=architecture_plan,
+            component_index=component_index,
+            components_by_name=components_by_name
+        )
+        
+        model = self._select_model(language, file_components, prompt)
+        response = self._generate_response(prompt, project_context, model)
+        
+        # Extract the code from the response
+        code = self._extract_code_from_response(response)
+        
+        return code
+    
+    def _select_model(self, language: str, file_components: List[str], prompt: str) -> Optional[str]:
+        """
+        Choose the model for a file.
+        
+        Args:
+            language: The programming language of the file
+            file_components: Components implemented in the file
+            prompt: The file-specific prompt
+            
+        Returns:
+            The fast model for simple files, or None for the default model
+        """
+        if not self.use_fast_model:
+            return None
+        
+        # Rough estimate of four characters per token
+        is_small = not file_components and len(prompt) // 4 < FAST_MODEL_MAX_PROMPT_TOKENS
+        if language in FAST_MODEL_LANGUAGES or is_small:
+            return self.anthropic_client.fast_model
+        return None
+    
+    def _generate_response(self, prompt: str, project_context: str,
+                           model: Optional[str] = None) -> str:
+        """
+        Get Claude's response to a code prompt.
+        
+        Responses are served from the client's response cache when it has
+        one, keyed by the model, the system prompt, the project context and
+        the prompt.
+        
+        Args:
+            prompt: The file-specific prompt
+            project_context: The shared project context
+            model: Optional model to use instead of the client's default
+            
+        Returns:
+            Claude's response as a string
+        """
+        return self.anthropic_client.generate_response(
+            prompt,
+            system_prompt=CODE_SYSTEM_PROMPT,
+            cached_context=project_context,
+            model=model
+        )
+    
+    def _create_code_prompt(self, file_path: str, file_description: str,
+                            file_components: List[str], language: str,
+                            architecture_plan: ArchitecturePlan,
+                            component_index: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                            components_by_name: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+        """
+        Create the file-specific part of the code generation prompt.
+        
+        Args:
+            file_path: Path to the file
+            file_description: Description of the file
+            file_components: Components implemented in the file
+            language: The programming language of the file
+            architecture_plan: The architecture plan
+            component_index: Index from _build_component_index used to list
+                    files sharing components with this one when
+                    include_related_files is set
+            components_by_name: Lookup from _build_components_by_name; built
+                    from the architecture plan when not provided
+            
+        Returns:
+            The prompt for the file
+        """
+        if components_by_name is None:
+            components_by_name = self._build_components_by_name(architecture_plan)
         
         # Extract components that should be implemented in this file
-        component_details = []
-        for component_name in file_components:
-            component = next((c for c in architecture_plan.components if c.name == component_name), None)
-            if component:
-                component_details.append(component.to_dict())
+        component_details = [
+            components_by_name[component_name]
+            for component_name in file_components
+            if component_name in components_by_name
+        ]
         
-        # Prepare the prompt for Claude
+        # Instructions shared by every file come first and the file-specific
+        # details last, so consecutive prompts share the longest possible prefix
         prompt = f"""
-        You are an expert software developer. Generate code for the following file in a project:
+        Generate code for the file of the project described below.
+        Provide ONLY the code for the file, no explanations.
+        Write clean, well-documented, high-quality code following best practices
+        for the file's programming language.
         
-        Project Type: {project_structure.project_type}
+        ---
+        FILE:
         File Path: {file_path}
         File Description: {file_description}
         Programming Language: {language}
         
         This file implements the following components:
-        {json.dumps(component_details, indent=2) if component_details else "No specific components"}
+        {json_utils.dumps(component_details, indent=2) if component_details else "No specific components"}
+        """
         
-        Project Structure:
-        Directories: {json.dumps(project_structure.directories, indent=2)}
+        if not self.include_related_files:
+            return prompt
+        
+        # Only a compact summary of each related file, sorted for stable prompts
+        related_files = sorted(
+            (
+                {
+                    "path": related["path"],
+                    "components": related.get("components", []),
+                    "description": related.get("description", "")[:RELATED_FILE_DESCRIPTION_LIMIT],
+                }
+                for related in self._find_related_files(file_components, component_index or {})
+                if related.get("path") != file_path
+            ),
+            key=lambda related: related["path"]
+        )
+        if related_files:
+            prompt += f"\n\nRelated Files (sharing components with this file):\n{json_utils.dumps(related_files)}"
         
-        Provide ONLY the code for the file, no explanations. 
-        Write clean, well-documented, high-quality code following best practices for {language}.
+        return prompt
+    
+    def _build_components_by_name(self, architecture_plan: ArchitecturePlan) -> Dict[str, Dict[str, Any]]:
         """
+        Index the serialized architecture components by component name.
         
-        if additional_context:
-            prompt += f"\n\nAdditional Context:\n{json.dumps(additional_context, indent=2)}"
+        Args:
+            architecture_plan: The architecture plan
+            
+        Returns:
+            Dictionary mapping component names to their dictionary form
+        """
+        components_by_name: Dict[str, Dict[str, Any]] = {}
+        for component in architecture_plan.components_as_dicts:
+            # Keep the first definition, matching the previous linear search
+            components_by_name.setdefault(component["name"], component)
+        return components_by_name
+    
+    def _build_component_index(self, files: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Build an inverted index from component name to the files implementing it.
         
-        response = self.anthropic_client.generate_response(prompt)
+        Built once per run so that related-file lookups are dictionary hits
+        instead of a scan over every file for every file.
         
-        # Extract the code from the response
-        code = self._extract_code_from_response(response, language)
+        Args:
+            files: File descriptors from the project structure
+            
+        Returns:
+            Dictionary mapping component names to file descriptors
+        """
+        component_index: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for file_info in files:
+            for component_name in file_info.get("components", []):
+                component_index[component_name].append(file_info)
+        return dict(component_index)
+    
+    def _find_related_files(self, file_components: List[str],
+                            component_index: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Find the files that implement any of the given components.
         
-        return code
+        Args:
+            file_components: Components implemented in the file
+            component_index: Index from _build_component_index
+            
+        Returns:
+            Unique file descriptors, in index order
+        """
+        seen = set()
+        related_files = []
+        for component_name in file_components:
+            for file_info in component_index.get(component_name, ()):
+                if id(file_info) not in seen:
+                    seen.add(id(file_info))
+                    related_files.append(file_info)
+        return related_files
+    
+    def _get_file_language(self, file_path: str) -> str:
+        """
+        Determine the programming language of a file from its path.
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            The programming language name
+        """
+        file_name = os.path.basename(file_path)
+        # Files such as Dockerfile or .env are identified by their whole name
+        extension = os.path.splitext(file_name)[1][1:] or file_name.lstrip(".")
+        return self._get_language_from_extension(extension)
     
-    def _extract_code_from_response(self, response: str, language: str) -> str:
+    def _extract_code_from_response(self, response: str) -> str:
         """
         Extract code from Claude's response.
         
         Args:
             response: Claude's response
-            language: The programming language
-            
-        Returns:
-            The extracted code
-        """
-        # Check for code blocks
-        language_markers = {
-            "python": ["```python", "```"],
-            "javascript": ["```javascript", "```", "```js", "```"],
-            "typescript": ["```typescript", "```", "```ts", "```"],
-            "html": ["```html", "```"],
-            "css": ["```css", "```"],
-            "json": ["```json", "```"],
-            "sql": ["```sql", "```"],
-            "bash": ["```bash", "```", "```sh", "```"],
-            "dockerfile": ["```dockerfile", "```"],
-            "yaml": ["```yaml", "```", "```yml", "```"],
-            "markdown": ["```markdown", "```", "```md", "```"],
-        }
-        
-        # Get markers for the language
-        markers = language_markers.get(language.lower(), ["```", "```"])
-        
-        # Check all possible markers
-        for start_marker in markers[:-1]:
-            if start_marker in response:
-                start_idx = response.find(start_marker) + len(start_marker)
-                end_marker = markers[-1]
-                end_idx = response.find(end_marker, start_idx)
-                
-                if end_idx != -1:
-                    return response[start_idx:end_idx].strip()
+            
+        Returns:
+            The code from the first fenced code block, or the full response
+            if it contains no code block
+        """
+        match = CODE_BLOCK_PATTERN.search(response)
+        if match:
+            return match.group(1).strip()
         
         # If no code block found, return the full response
         return response.strip()
@@ -192,44 +1061,7 @@ class CodeGenerator:
         Returns:
             The programming language name
         """
-        extension_map = {
-            "py": "python",
-            "js": "javascript",
-            "jsx": "javascript",
-            "ts": "typescript",
-            "tsx": "typescript",
-            "html": "html",
-            "css": "css",
-            "scss": "css",
-            "sass": "css",
-            "json": "json",
-            "md": "markdown",
-            "yml": "yaml",
-            "yaml": "yaml",
-            "sql": "sql",
-            "sh": "bash",
-            "bash": "bash",
-            "dockerfile": "dockerfile",
-            "Dockerfile": "dockerfile",
-            "java": "java",
-            "kt": "kotlin",
-            "rb": "ruby",
-            "php": "php",
-            "c": "c",
-            "cpp": "cpp",
-            "cs": "csharp",
-            "go": "go",
-            "rs": "rust",
-            "swift": "swift",
-            "txt": "text",
-            "xml": "xml",
-            "ini": "ini",
-            "cfg": "ini",
-            "conf": "ini",
-            "env": "env",
-        }
-        
-        return extension_map.get(extension.lower(), "text")
+        return EXTENSION_LANGUAGES.get(extension.lower(), "text")
     
     def get_files(self, project_structure: Union[ProjectStructure, Any], 
                  architecture_plan: Union[ArchitecturePlan, Any]) -> Dict[str, str]:
@@ -1,11 +1,47 @@
 import logging
-import json
-from typing import Dict, List, Any, Optional, Union
+import re
+from functools import cached_property
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, Pattern, Tuple, Union
 
 from src.models.project_type import ProjectType
 from src.models.architecture_plan import ArchitecturePlan
-from src.clients.anthropic_client import AnthropicClient
+from src.clients.anthropic_client import AnthropicClient, get_default_client
+from src.clients.llm_cache import CacheBackend, make_cache_key
 from src.config.config import Config
+from src.utils import json_utils
+from src.utils.json_extract import load_first_json_object
+
+
+# Splits a requirement such as "flask>=2.0", "'express': '^4.17.1'" or "express:^4.17.1" from its version.
+# A colon only separates a version, so Maven coordinates such as
+# "org.example:artifact:1.0" keep their groupId and artifactId
+VERSION_SPECIFIER_PATTERN: Pattern[str] = re.compile(r"[=<>!~\[; '\"]|:(?=\s*[\^~<>=*\d])")
+
+# Characters stripped from requirements and from the name and version of
+# "name": "version" entries
+PACKAGE_NAME_STRIP_CHARS = " \t\r\n\"'"
+PACKAGE_VERSION_STRIP_CHARS = " \t\r\n\"',"
+
+PYTHON_KEYWORDS = frozenset(["flask", "django", "sqlalchemy", "pandas", "pytest", "requests"])
+NODE_KEYWORDS = frozenset(["express", "react", "vue", "angular", "jest", "webpack"])
+
+# Predefined dependencies of common project types, shared read-only by all instances
+DEPENDENCY_TEMPLATES: Mapping[str, Mapping[str, Tuple[str, ...]]] = MappingProxyType({
+    "python": MappingProxyType({
+        "web": ("flask", "requests", "sqlalchemy", "pytest"),
+        "data_science": ("numpy", "pandas", "scikit-learn", "matplotlib"),
+        "cli": ("click", "rich", "pyyaml")
+    }),
+    "javascript": MappingProxyType({
+        "react": ("react", "react-dom", "react-router-dom", "axios"),
+        "node": ("express", "mongoose", "dotenv", "jest")
+    }),
+    "java": MappingProxyType({
+        "spring": ("spring-boot-starter-web", "spring-boot-starter-data-jpa", "h2"),
+        "android": ("androidx.appcompat:appcompat", "com.google.android.material:material")
+    })
+})
 
 
 class DependencyManager:
@@ -16,46 +52,39 @@ class DependencyManager:
     required for a project based on its type and architecture plan.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None,
+                 cache: Optional[CacheBackend] = None,
+                 anthropic_client: Optional[AnthropicClient] = None):
         """
         Initialize the DependencyManager.
         
         Args:
             api_key: Optional Anthropic API key. If not provided, will use
                     the ANTHROPIC_API_KEY environment variable.
+            cache: Optional cache for Claude responses
+            anthropic_client: Optional pre-built client to use instead of
+                    creating one; api_key and cache are then ignored. Without
+                    any of the three, the shared default client is used.
         """
-        # Create a Config object and set the API key if provided
-        config = Config()
-        if api_key:
-            config.anthropic_api_key = api_key
-            
-        self.anthropic_client = AnthropicClient(config)
+        self._api_key = api_key
+        self._cache = cache
+        self._anthropic_client = anthropic_client
         self.logger = logging.getLogger(__name__)
-        self.dependency_templates = self._load_dependency_templates()
+        self.dependency_templates = DEPENDENCY_TEMPLATES
     
-    def _load_dependency_templates(self) -> Dict[str, Dict[str, List[str]]]:
-        """
-        Load predefined dependency templates for common project types.
+    @cached_property
+    def anthropic_client(self) -> AnthropicClient:
+        """The Anthropic client, created on first use."""
+        if self._anthropic_client is not None:
+            return self._anthropic_client
+        if not self._api_key and self._cache is None:
+            return get_default_client()
         
-        Returns:
-            Dictionary mapping project types to their common dependencies
-        """
-        # This could be loaded from a JSON file in a real implementation
-        return {
-            "python": {
-                "web": ["flask", "requests", "sqlalchemy", "pytest"],
-                "data_science": ["numpy", "pandas", "scikit-learn", "matplotlib"],
-                "cli": ["click", "rich", "pyyaml"]
-            },
-            "javascript": {
-                "react": ["react", "react-dom", "react-router-dom", "axios"],
-                "node": ["express", "mongoose", "dotenv", "jest"]
-            },
-            "java": {
-                "spring": ["spring-boot-starter-web", "spring-boot-starter-data-jpa", "h2"],
-                "android": ["androidx.appcompat:appcompat", "com.google.android.material:material"]
-            }
-        }
+        # Create a Config object and set the API key if provided
+        config = Config()
+        if self._api_key:
+            config.anthropic_api_key = self._api_key
+        return AnthropicClient(config, cache=self._cache)
     
     def determine_dependencies(self, project_type: Union[ProjectType, str], 
                              architecture_plan: ArchitecturePlan) -> List[str]:
@@ -72,10 +101,75 @@ class DependencyManager:
         project_type_name = project_type.name if isinstance(project_type, ProjectType) else project_type
         self.logger.info(f"Determining dependencies for {project_type_name} project")
         
-        # Prepare the prompt for Claude
-        components_str = json.dumps([comp.to_dict() for comp in architecture_plan.components], indent=2)
+        # Key the cache by the plan so the prompt is only built on a miss
+        cache_key = make_cache_key(task="dependencies", project_type=project_type_name,
+                                   plan=architecture_plan.content_hash())
+        response = self.anthropic_client.get_cached_response(cache_key, json_object=True)
+        if response is None:
+            prompt = self._create_dependencies_prompt(project_type_name, architecture_plan)
+            response = self.anthropic_client.generate_json_response(prompt, cache_key=cache_key)
+        all_deps = self._parse_dependencies_response(response)
+        
+        self.logger.info(f"Determined {len(all_deps)} dependencies")
+        return all_deps
+    
+    def determine_dependencies_batch(self, projects: List[Tuple[Union[ProjectType, str], ArchitecturePlan]],
+                                     poll_interval: float = 60.0) -> List[List[str]]:
+        """
+        Determine dependencies for several projects in one message batch.
+        
+        Batched requests cost half as much but may take hours to complete,
+        so this is meant for offline analysis of many architecture plans.
+        
+        Args:
+            projects: List of (project type, architecture plan) pairs
+            poll_interval: Seconds to wait between batch status checks
+            
+        Returns:
+            List of dependency lists, in the order of the given projects
+        """
+        self.logger.info(f"Determining dependencies for {len(projects)} projects with a message batch")
+        
+        prompts = {}
+        for index, (project_type, architecture_plan) in enumerate(projects):
+            project_type_name = project_type.name if isinstance(project_type, ProjectType) else project_type
+            prompts[str(index)] = self._create_dependencies_prompt(project_type_name, architecture_plan)
+        
+        responses = self.anthropic_client.generate_batch_responses(prompts, poll_interval=poll_interval)
         
-        prompt = f"""
+        results = []
+        for index in range(len(projects)):
+            response = responses.get(str(index))
+            if response is None:
+                self.logger.error(f"Could not determine dependencies for project {index}: batch request failed")
+                results.append([])
+            else:
+                results.append(self._parse_dependencies_response(response))
+        return results
+    
+    def _create_dependencies_prompt(self, project_type_name: str, architecture_plan: ArchitecturePlan) -> str:
+        """
+        Create the prompt asking Claude for a project's dependencies.
+        
+        Args:
+            project_type_name: Name of the project type
+            architecture_plan: The architecture plan of the project
+            
+        Returns:
+            The prompt as a string
+        """
+        # Only the fields that matter for dependencies, without indentation
+        components = []
+        for comp in architecture_plan.components:
+            component = {"name": comp.name}
+            if comp.purpose:
+                component["purpose"] = comp.purpose
+            if comp.technologies:
+                component["technologies"] = comp.technologies
+            components.append(component)
+        components_str = json_utils.dumps(components)
+        
+        return f"""
         You are an expert in software dependencies. Based on the following project type and architecture components,
         determine the necessary dependencies for the project.
         
@@ -93,42 +187,47 @@ class DependencyManager:
         Each dependency should be a string in the format appropriate for the project type.
         For example, for Python: 'flask==2.0.1', for Node.js: 'express': '^4.17.1'
         """
+    
+    def _parse_dependencies_response(self, response: str) -> List[str]:
+        """
+        Parse Claude's dependencies response into a flat list.
         
-        response = self.anthropic_client.generate_response(prompt)
-        
-        # Parse the response to extract dependencies
-        try:
-            # Try to parse the entire response as JSON
-            result = json.loads(response)
-        except json.JSONDecodeError:
-            # If that fails, try to extract JSON from the response
-            try:
-                # Look for JSON between triple backticks
-                json_match = response.split("```json")[1].split("```")[0].strip()
-                result = json.loads(json_match)
-            except (IndexError, json.JSONDecodeError):
-                # Try finding JSON object using regex-like approach
-                import re
-                json_pattern = re.compile(r'\{.*\}', re.DOTALL)
-                match = json_pattern.search(response)
-                if match:
-                    try:
-                        result = json.loads(match.group(0))
-                    except json.JSONDecodeError:
-                        self.logger.error("Could not parse JSON from Claude's response")
-                        result = {"main": [], "test": [], "dev": []}
-                else:
-                    self.logger.error("Could not parse JSON from Claude's response")
-                    result = {"main": [], "test": [], "dev": []}
+        Args:
+            response: Claude's response
+            
+        Returns:
+            List of dependencies
+        """
+        result = load_first_json_object(response)
+        if result is None:
+            self.logger.error("Could not parse JSON from Claude's response")
+            result = {"main": [], "test": [], "dev": []}
         
-        # Combine all dependencies into a flat list
+        # Combine all dependencies into a flat list, keeping the first
+        # occurrence of packages listed in several categories
         all_deps = []
+        seen_packages = set()
         for category in ["main", "test", "dev"]:
-            all_deps.extend(result.get(category, []))
+            for dep in result.get(category, []):
+                package = self._get_package_name(dep)
+                if package not in seen_packages:
+                    seen_packages.add(package)
+                    all_deps.append(dep)
         
-        self.logger.info(f"Determined {len(all_deps)} dependencies")
         return all_deps
     
+    def _get_package_name(self, dependency: str) -> str:
+        """
+        Get the package name of a dependency string.
+        
+        Args:
+            dependency: Dependency such as "flask==2.0.1" or "'express': '^4.17.1'"
+            
+        Returns:
+            The lowercase package name
+        """
+        return VERSION_SPECIFIER_PATTERN.split(dependency.strip().strip("\"'"), 1)[0].lower()
+    
     def generate_dependency_files(self, dependencies: List[str]) -> Dict[str, str]:
         """
         Generate dependency files based on the list of dependencies.
@@ -151,9 +250,11 @@ class DependencyManager:
         files = {}
         
         if project_type == "python":
-            # Generate requirements.txt
-            requirements = "\n".join(dependencies)
-            files["requirements.txt"] = requirements
+            # Generate requirements.txt, cleaning up stray quotes and blank entries
+            requirements = "\n".join(
+                stripped for stripped in (dep.strip(PACKAGE_VERSION_STRIP_CHARS) for dep in dependencies) if stripped
+            )
+            files["requirements.txt"] = requirements + "\n"
         
         elif project_type == "node" or project_type == "javascript":
             # Generate package.json
@@ -174,13 +275,13 @@ class DependencyManager:
             for dep in dependencies:
                 if ":" in dep:
                     name, version = dep.split(":", 1)
-                    name = name.strip().strip('"\'')
-                    version = version.strip().strip('"\',')
+                    name = name.strip(PACKAGE_NAME_STRIP_CHARS)
+                    version = version.strip(PACKAGE_VERSION_STRIP_CHARS)
                     package_json["dependencies"][name] = version
                 else:
                     package_json["dependencies"][dep] = "latest"
             
-            files["package.json"] = json.dumps(package_json, indent=2)
+            files["package.json"] = json_utils.dumps(package_json, indent=2)
         
         self.logger.info(f"Generated {len(files)} dependency files")
         return files
@@ -195,14 +296,14 @@ class DependencyManager:
         Returns:
             Project type (python, node, etc.)
         """
+        packages = {self._get_package_name(dep) for dep in dependencies}
+        
         # Check for Python-specific dependencies
-        python_keywords = ["flask", "django", "sqlalchemy", "pandas", "pytest", "requests"]
-        if any(dep.split("==")[0].lower() in python_keywords for dep in dependencies):
+        if not packages.isdisjoint(PYTHON_KEYWORDS):
             return "python"
         
         # Check for Node/JavaScript-specific dependencies
-        node_keywords = ["express", "react", "vue", "angular", "jest", "webpack"]
-        if any(dep.split(":")[0].strip().lower() in node_keywords for dep in dependencies):
+        if not packages.isdisjoint(NODE_KEYWORDS):
             return "node"
         
         # Default to python if we can't determine
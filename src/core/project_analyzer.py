@@ -9,13 +9,27 @@ the project type and extract key requirements using the Anthropic Claude API.
 
 import os
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Dict, Any, Optional, Pattern, Tuple
 
 from anthropic import Anthropic
 
 from src.models.project_type import ProjectType, ProjectTypeEnum
-from src.clients.anthropic_client import AnthropicClient
+from src.clients.anthropic_client import AnthropicClient, get_default_client
+from src.clients.llm_cache import CacheBackend, SemanticCache
 from src.config.config import Config
+from src.utils.json_extract import load_first_json_object
+
+# Project types Claude may choose from, as listed in prompts
+PROJECT_TYPE_NAMES = ", ".join(project_type.name for project_type in ProjectTypeEnum)
+
+# "PROJECT_TYPE: explanation" answer, tolerating leading Markdown such as "**"
+PROJECT_TYPE_ANSWER_PATTERN: Pattern[str] = re.compile(r"^\W*([A-Za-z_]+)[^\w:-]*[:-]\s*(.*)", re.DOTALL)
+
+# Numbered list item such as "1. text" or "2) text", capturing the text
+NUMBERED_ITEM_PATTERN: Pattern[str] = re.compile(r"^\s*\d+[.)]\s+(.+)$")
 
 
 class ProjectAnalyzer:
@@ -25,19 +39,34 @@ class ProjectAnalyzer:
     and extract meaningful information about the project type and requirements.
     """
 
-    def __init__(self, api_key: Optional[str] = None) -> None:
+    def __init__(self, api_key: Optional[str] = None,
+                 cache: Optional[CacheBackend] = None,
+                 anthropic_client: Optional[AnthropicClient] = None,
+                 semantic_cache: Optional[SemanticCache] = None) -> None:
         """Initialize the ProjectAnalyzer with an Anthropic client.
         
         Args:
             api_key: Optional Anthropic API key. If not provided, will attempt
                     to use the ANTHROPIC_API_KEY environment variable.
+            cache: Optional cache for Claude responses
+            anthropic_client: Optional pre-built client to use instead of
+                    creating one; api_key and cache are then ignored. Without
+                    any of the three, the shared default client is used.
+            semantic_cache: Optional cache reusing responses for descriptions
+                    that are worded differently but mean the same
         """
-        # Create a Config object and set the API key if provided
-        config = Config()
-        if api_key:
-            config.anthropic_api_key = api_key
+        if anthropic_client is None:
+            if api_key or cache is not None:
+                # Create a Config object and set the API key if provided
+                config = Config()
+                if api_key:
+                    config.anthropic_api_key = api_key
+                anthropic_client = AnthropicClient(config, cache=cache)
+            else:
+                anthropic_client = get_default_client()
         
-        self.anthropic_client = AnthropicClient(config)
+        self.anthropic_client = anthropic_client
+        self.semantic_cache = semantic_cache
         self.logger = logging.getLogger(__name__)
 
     def analyze_project_description(self, description: str) -> ProjectType:
@@ -57,7 +86,7 @@ class ProjectAnalyzer:
         prompt = f"""
         You are an expert software architect. Based on the following project description, 
         determine the most appropriate project type from these options:
-        {', '.join([t.name for t in ProjectTypeEnum])}
+        {PROJECT_TYPE_NAMES}
         
         Project Description:
         {description}
@@ -66,19 +95,22 @@ class ProjectAnalyzer:
         Format: PROJECT_TYPE: explanation
         """
         
-        response = self.anthropic_client.generate_response(prompt)
+        response = self._generate("project_type", description, prompt)
         
         # Extract project type from response
         try:
-            project_type_str = response.split(':', 1)[0].strip().upper()
+            match = PROJECT_TYPE_ANSWER_PATTERN.match(response.strip())
+            if match:
+                project_type_str, explanation = match.group(1).upper(), match.group(2).strip()
+            else:
+                project_type_str, explanation = response.strip().upper(), ""
             project_type = ProjectTypeEnum[project_type_str]
-            explanation = response.split(':', 1)[1].strip() if ':' in response else ""
             
             return ProjectType(
                 type_enum=project_type,
                 description=explanation
             )
-        except (KeyError, IndexError) as e:
+        except KeyError as e:
             self.logger.error(f"Failed to determine project type: {e}")
             self.logger.debug(f"Claude response: {response}")
             raise ValueError(f"Could not determine project type from response: {response}") from e
@@ -105,17 +137,16 @@ class ProjectAnalyzer:
         Be specific and concise. Include both functional and technical requirements.
         """
         
-        response = self.anthropic_client.generate_response(prompt)
+        response = self._generate("requirements", description, prompt)
         
         # Process the response to extract requirements as a list
         requirements = []
         for line in response.strip().split('\n'):
-            # Remove numbering and leading/trailing whitespace
             cleaned_line = line.strip()
-            if cleaned_line and any(c.isdigit() for c in cleaned_line[0:2]):
-                # Remove the numbering (assumes format like "1. " or "1) ")
-                requirement = cleaned_line.split(' ', 1)[1].strip() if ' ' in cleaned_line else cleaned_line
-                requirements.append(requirement)
+            match = NUMBERED_ITEM_PATTERN.match(cleaned_line)
+            if match:
+                # Remove the numbering
+                requirements.append(match.group(1).strip())
             elif cleaned_line and not cleaned_line.startswith('#') and len(cleaned_line) > 10:
                 # Include lines that aren't headers and have substantial content
                 requirements.append(cleaned_line)
@@ -123,19 +154,107 @@ class ProjectAnalyzer:
         self.logger.info(f"Extracted {len(requirements)} requirements")
         return requirements
         
-    def analyze(self, description: str) -> Tuple[str, List[str]]:
+    def analyze_combined(self, description: str) -> Tuple[ProjectType, List[str]]:
+        """Determine the project type and key requirements with a single request.
+        
+        Args:
+            description: The project description text
+            
+        Returns:
+            Tuple containing the project type and list of requirements
+            
+        Raises:
+            ValueError: If the project type cannot be determined
+        """
+        self.logger.info("Analyzing project type and requirements")
+        
+        prompt = f"""
+        You are an expert software architect and requirements analyst. Based on the
+        following project description, determine the most appropriate project type
+        and extract a list of key functional and non-functional requirements.
+        
+        Project Description:
+        {description}
+        
+        Respond with a JSON object with the following keys:
+        - "project_type": one of {PROJECT_TYPE_NAMES}
+        - "explanation": a brief explanation why you chose the project type
+        - "requirements": an array of requirements, each a specific and concise string
+        """
+        
+        response = self._generate("combined", description, prompt, json_response=True)
+        
+        result = load_first_json_object(response)
+        try:
+            project_type = ProjectType(
+                type_enum=ProjectTypeEnum[str(result["project_type"]).strip().upper()],
+                description=str(result.get("explanation", ""))
+            )
+        except (KeyError, TypeError) as e:
+            self.logger.error(f"Failed to determine project type: {e}")
+            self.logger.debug(f"Claude response: {response}")
+            raise ValueError(f"Could not determine project type from response: {response}") from e
+        
+        requirements = [str(requirement).strip() for requirement in result.get("requirements") or []]
+        requirements = [requirement for requirement in requirements if requirement]
+        
+        self.logger.info(f"Extracted {len(requirements)} requirements")
+        return project_type, requirements
+        
+    def analyze_project(self, description: str) -> Tuple[ProjectType, List[str]]:
         """Analyze the project description to determine type and requirements.
         
-        This is a convenience method that combines analyze_project_description
-        and extract_key_requirements.
+        Both are determined with a single request through analyze_combined.
+        If that response cannot be parsed, analyze_project_description and
+        extract_key_requirements are used instead, running concurrently.
         
         Args:
             description: The project description text
             
         Returns:
-            Tuple containing project type and list of requirements
+            Tuple containing the project type and list of requirements
         """
-        project_type = self.analyze_project_description(description)
-        requirements = self.extract_key_requirements(description)
+        try:
+            project_type, requirements = self.analyze_combined(description)
+        except ValueError:
+            self.logger.warning("Combined analysis failed, analyzing type and requirements separately")
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                project_type_future = executor.submit(self.analyze_project_description, description)
+                requirements_future = executor.submit(self.extract_key_requirements, description)
+                project_type = project_type_future.result()
+                requirements = requirements_future.result()
+        
+        return project_type, requirements
+    
+    def analyze(self, description: str) -> Tuple[str, List[str]]:
+        """Analyze the project description to determine type and requirements.
         
+        Args:
+            description: The project description text
+            
+        Returns:
+            Tuple containing project type name and list of requirements
+        """
+        project_type, requirements = self.analyze_project(description)
         return project_type.name, requirements
+    
+    def _generate(self, task: str, description: str, prompt: str, json_response: bool = False) -> str:
+        """Get Claude's response to a prompt about a project description.
+        
+        Args:
+            task: Name of the analysis, keeping responses of different analyses apart
+            description: The project description the prompt was built from
+            prompt: The prompt to send to Claude
+            json_response: Whether the prompt asks for a JSON object
+            
+        Returns:
+            Claude's response, possibly reused for a similar description
+        """
+        if json_response:
+            generate = partial(self.anthropic_client.generate_json_response, prompt)
+        else:
+            generate = partial(self.anthropic_client.generate_response, prompt)
+        
+        if self.semantic_cache is None:
+            return generate()
+        return self.semantic_cache.get_or_compute(task, description, generate)
@@ -1,11 +1,13 @@
 import logging
-import json
 from typing import Dict, List, Any, Optional
 
 from src.models.architecture_plan import ArchitecturePlan
 from src.models.project_structure import ProjectStructure
-from src.clients.anthropic_client import AnthropicClient
+from src.clients.anthropic_client import AnthropicClient, get_default_client
+from src.clients.llm_cache import CacheBackend, make_cache_key
 from src.config.config import Config
+from src.utils import json_utils
+from src.utils.json_extract import load_first_json_object
 
 
 class ProjectStructureGenerator:
@@ -16,20 +18,31 @@ class ProjectStructureGenerator:
     based on an architecture plan, including directories and files.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None,
+                 cache: Optional[CacheBackend] = None,
+                 anthropic_client: Optional[AnthropicClient] = None):
         """
         Initialize the ProjectStructureGenerator.
         
         Args:
             api_key: Optional Anthropic API key. If not provided, will use
                     the ANTHROPIC_API_KEY environment variable.
+            cache: Optional cache for Claude responses
+            anthropic_client: Optional pre-built client to use instead of
+                    creating one; api_key and cache are then ignored. Without
+                    any of the three, the shared default client is used.
         """
-        # Create a Config object and set the API key if provided
-        config = Config()
-        if api_key:
-            config.anthropic_api_key = api_key
+        if anthropic_client is None:
+            if api_key or cache is not None:
+                # Create a Config object and set the API key if provided
+                config = Config()
+                if api_key:
+                    config.anthropic_api_key = api_key
+                anthropic_client = AnthropicClient(config, cache=cache)
+            else:
+                anthropic_client = get_default_client()
             
-        self.anthropic_client = AnthropicClient(config)
+        self.anthropic_client = anthropic_client
         self.logger = logging.getLogger(__name__)
     
     def generate_structure(self, architecture_plan: ArchitecturePlan, 
@@ -46,74 +59,19 @@ class ProjectStructureGenerator:
         """
         self.logger.info("Generating project structure")
         
-        # Prepare the prompt for Claude
-        components_str = json.dumps([comp.to_dict() for comp in architecture_plan.components], indent=2)
-        dependencies_str = json.dumps([dep.to_dict() for dep in architecture_plan.dependencies], indent=2)
-        data_flows_str = json.dumps([flow.to_dict() for flow in architecture_plan.data_flows], indent=2)
-        
-        additional_context_str = ""
-        if additional_context:
-            additional_context_str = "Additional context:\n" + json.dumps(additional_context, indent=2)
-        
-        prompt = f"""
-        You are an expert software architect. Based on the following architecture plan,
-        generate a detailed project structure including directories and files.
-        
-        Project Type: {architecture_plan.project_type.name}
-        
-        Components:
-        {components_str}
-        
-        Dependencies:
-        {dependencies_str}
-        
-        Data Flows:
-        {data_flows_str}
-        
-        {additional_context_str}
-        
-        Provide your response as a JSON object with the following structure:
-        {{
-            "directories": ["list", "of", "directory", "paths"],
-            "files": [
-                {{
-                    "path": "path/to/file",
-                    "description": "description of the file's purpose",
-                    "components": ["list", "of", "components", "implemented", "in", "this", "file"]
-                }}
-            ]
-        }}
-        
-        Consider standard project layouts for {architecture_plan.project_type.name} projects.
-        Include all necessary files for a complete and working project.
-        """
-        
-        response = self.anthropic_client.generate_response(prompt)
+        # Key the cache by the plan so the prompt is only built on a miss
+        cache_key = make_cache_key(task="structure", plan=architecture_plan.content_hash(),
+                                   additional_context=additional_context)
+        response = self.anthropic_client.get_cached_response(cache_key, json_object=True)
+        if response is None:
+            prompt = self._create_structure_prompt(architecture_plan, additional_context)
+            response = self.anthropic_client.generate_json_response(prompt, cache_key=cache_key)
         
         # Parse the response to extract the structure
-        try:
-            # Try to parse the entire response as JSON
-            result = json.loads(response)
-        except json.JSONDecodeError:
-            # If that fails, try to extract JSON from the response
-            try:
-                # Look for JSON between triple backticks
-                json_match = response.split("```json")[1].split("```")[0].strip()
-                result = json.loads(json_match)
-            except (IndexError, json.JSONDecodeError):
-                # Try finding JSON object using regex-like approach
-                import re
-                json_pattern = re.compile(r'\{.*\}', re.DOTALL)
-                match = json_pattern.search(response)
-                if match:
-                    try:
-                        result = json.loads(match.group(0))
-                    except json.JSONDecodeError:
-                        self.logger.error("Could not parse JSON from Claude's response")
-                        result = {"directories": [], "files": []}
-                else:
-                    self.logger.error("Could not parse JSON from Claude's response")
-                    result = {"directories": [], "files": []}
+        result = load_first_json_object(response)
+        if result is None:
+            self.logger.error("Could not parse JSON from Claude's response")
+            result = {"directories": [], "files": []}
         
         # Create the project structure
         return ProjectStructure(
@@ -123,6 +81,55 @@ class ProjectStructureGenerator:
             files=result.get("files", [])
         )
     
+    def _create_structure_prompt(self, architecture_plan: ArchitecturePlan,
+                                 additional_context: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Create the prompt asking Claude for the structure of a planned project.
+        
+        Args:
+            architecture_plan: The architecture plan for the project
+            additional_context: Additional context for structure generation
+            
+        Returns:
+            The prompt as a string
+        """
+        project_type_name = architecture_plan.project_type.name
+        
+        # Assembled from parts so each serialized section is copied only once,
+        # and sections the plan does not have are left out. The JSON is compact
+        # since indentation only adds tokens.
+        parts = [
+            "You are an expert software architect. Based on the following architecture plan,\n"
+            "generate a detailed project structure including directories and files.\n\n"
+            "Project Type: ", project_type_name,
+            "\n\nComponents:\n",
+            json_utils.dumps(architecture_plan.components_as_dicts),
+        ]
+        if architecture_plan.dependencies:
+            parts += ["\n\nDependencies:\n",
+                      json_utils.dumps(architecture_plan.dependencies_as_dicts)]
+        if architecture_plan.data_flows:
+            parts += ["\n\nData Flows:\n",
+                      json_utils.dumps(architecture_plan.data_flows_as_dicts)]
+        if additional_context:
+            parts += ["\n\nAdditional context:\n", json_utils.dumps(additional_context)]
+        parts += [
+            "\n\nProvide your response as a JSON object with the following structure:\n"
+            "{\n"
+            '    "directories": ["list", "of", "directory", "paths"],\n'
+            '    "files": [\n'
+            "        {\n"
+            '            "path": "path/to/file",\n'
+            '            "description": "description of the file\'s purpose",\n'
+            '            "components": ["list", "of", "components", "implemented", "in", "this", "file"]\n'
+            "        }\n"
+            "    ]\n"
+            "}\n\n"
+            "Consider standard project layouts for ", project_type_name, " projects.\n"
+            "Include all necessary files for a complete and working project.\n"
+        ]
+        return "".join(parts)
+    
     def generate_structure_from_description(self, project_name: str, 
                                            description: str) -> ProjectStructure:
         """
@@ -165,28 +172,13 @@ class ProjectStructureGenerator:
         Include all necessary files for a complete and working project.
         """
         
-        response = self.anthropic_client.generate_response(prompt)
+        response = self.anthropic_client.generate_json_response(prompt)
         
         # Parse the response
-        try:
-            result = json.loads(response)
-        except json.JSONDecodeError:
-            try:
-                json_match = response.split("```json")[1].split("```")[0].strip()
-                result = json.loads(json_match)
-            except (IndexError, json.JSONDecodeError):
-                import re
-                json_pattern = re.compile(r'\{.*\}', re.DOTALL)
-                match = json_pattern.search(response)
-                if match:
-                    try:
-                        result = json.loads(match.group(0))
-                    except json.JSONDecodeError:
-                        self.logger.error("Could not parse JSON from Claude's response")
-                        result = {"project_type": "unknown", "directories": [], "files": []}
-                else:
-                    self.logger.error("Could not parse JSON from Claude's response")
-                    result = {"project_type": "unknown", "directories": [], "files": []}
+        result = load_first_json_object(response)
+        if result is None:
+            self.logger.error("Could not parse JSON from Claude's response")
+            result = {"project_type": "unknown", "directories": [], "files": []}
         
         # Create the project structure
         return ProjectStructure(
@@ -1,28 +1,87 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse, Response
 import os
+import glob
+import time
 import tempfile
 import logging
+import zipfile
+import contextlib
 from typing import Dict, Any, Optional
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pydantic import BaseModel
 
-from src.project_generator import ProjectGenerator
+from src.clients.llm_cache import InMemoryLRUCache
+from src.project_generator import ARCHIVE_ROOT, ProjectGenerator
+from src.utils import json_utils
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Project Generator API",
     description="API for generating project structures and code based on descriptions",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse if json_utils.orjson is not None else JSONResponse
 )
 
 # Initialize project generator
 project_generator = ProjectGenerator()
 
+# Threads running blocking project generation, so it neither stalls the event
+# loop nor competes for the server's default thread pool
+EXECUTOR = ThreadPoolExecutor(max_workers=int(os.getenv("PG_WORKERS", "32")))
+
+# Threads building download archives, kept apart from generation so that
+# long-running generations cannot hold up downloads
+ARCHIVE_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Seconds a rebuilt project archive is served before being rebuilt again
+ARCHIVE_CACHE_TTL = 3600
+
+# Seconds between sweeps removing rebuilt archives older than ARCHIVE_CACHE_TTL
+ARCHIVE_CLEANUP_INTERVAL = 300
+
+# Paths of project archives rebuilt for download, by project ID
+_archive_cache = InMemoryLRUCache(max_entries=128)
+
+# Archive rebuilds in progress, by project ID, so concurrent downloads of a
+# project share one rebuild while different projects are rebuilt in parallel
+_archive_builds: Dict[str, "asyncio.Future[str]"] = {}
+
+# Serialized status responses of the most recently polled finished projects,
+# which no longer change
+_status_cache = InMemoryLRUCache(max_entries=1024)
+
+# zlib level for deflated archive entries; source code still compresses well
+# at the fastest level, at a fraction of the CPU time of the default
+ARCHIVE_COMPRESSLEVEL = 1
+
+# Extensions of files that are already compressed and not worth deflating
+COMPRESSED_EXTENSIONS = frozenset({
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".jar", ".whl",
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico", ".woff", ".woff2", ".pdf"
+})
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_cleanup_task: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def start_archive_cleanup():
+    """Start periodically removing expired project archives."""
+    global _cleanup_task
+    _cleanup_task = asyncio.create_task(_cleanup_archives_periodically())
+
+@app.on_event("shutdown")
+async def stop_archive_cleanup():
+    """Stop removing expired project archives."""
+    if _cleanup_task is not None:
+        _cleanup_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _cleanup_task
+
 # Define request and response models
 class ProjectRequest(BaseModel):
     description: str
@@ -48,7 +107,7 @@ async def generate_project(request: ProjectRequest):
     Returns a project ID that can be used to check status and download the result.
     """
     try:
-        project_id = await project_generator.generate_project_async(request.description)
+        project_id = await project_generator.generate_project_async(request.description, EXECUTOR)
         return {
             "project_id": project_id,
             "status": "in_progress",
@@ -62,7 +121,14 @@ async def generate_project(request: ProjectRequest):
 async def get_project_status(project_id: str):
     """
     Get the status of a project generation task.
+    
+    Statuses of completed and failed projects are final, so their response
+    is serialized once and sent as-is to later polls.
     """
+    cached = _status_cache.get(project_id)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
     try:
         project = project_generator.get_project(project_id)
         response = {
@@ -75,8 +141,12 @@ async def get_project_status(project_id: str):
             response["files"] = project.get("files")
         elif project["status"] == "failed":
             response["error"] = project.get("error")
-            
-        return response
+        else:
+            return response
+        
+        content = ProjectStatusResponse(**response).model_dump_json()
+        _status_cache.set(project_id, content)
+        return Response(content=content, media_type="application/json")
     except KeyError:
         raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
     except Exception as e:
@@ -97,50 +167,154 @@ async def download_project(project_id: str):
                 detail=f"Project is not ready for download. Current status: {project['status']}"
             )
         
-        # Create a temporary directory for the project files
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Get project files
-            files = project_generator.get_project_files(project_id)
-            
-            # Save files to the temporary directory
-            project_generator.output_manager.save_project_files(files, temp_dir)
-            
-            # Create a zip archive
-            zip_path = project_generator.output_manager.create_project_archive(
-                temp_dir, 
-                os.path.join(tempfile.gettempdir(), f"project_{project_id}.zip")
-            )
-            
-            # Return the zip file
+        # Serve the archive built during generation when it is still on disk
+        archive_path = project.get("archive_path")
+        if archive_path and os.path.isfile(archive_path):
             return FileResponse(
-                path=zip_path,
+                path=archive_path,
                 filename=f"project_{project_id}.zip",
                 media_type="application/zip"
             )
+        
+        # Otherwise rebuild it once and serve the rebuilt archive until it expires
+        zip_path = _archive_cache.get(project_id)
+        if not zip_path or not os.path.isfile(zip_path):
+            zip_path = await _rebuild_archive(project_id)
+        
+        # Return the zip file
+        return FileResponse(
+            path=zip_path,
+            filename=f"project_{project_id}.zip",
+            media_type="application/zip"
+        )
     except KeyError:
         raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
     except Exception as e:
         logger.error(f"Error downloading project: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.delete("/projects/{project_id}", response_model=ProjectResponse)
+async def delete_project(project_id: str):
+    """
+    Delete a project and evict its cached archive.
+    """
+    try:
+        # Removing the project's saved files blocks, so run it off the event loop
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(ARCHIVE_EXECUTOR, project_generator.delete_project, project_id)
+        _status_cache.delete(project_id)
+        zip_path = _archive_cache.get(project_id)
+        _archive_cache.delete(project_id)
+        if zip_path and os.path.isfile(zip_path):
+            os.remove(zip_path)
+        return {
+            "project_id": project_id,
+            "status": "deleted",
+            "message": "Project deleted"
+        }
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
+    except Exception as e:
+        logger.error(f"Error deleting project: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def _rebuild_archive(project_id: str) -> str:
+    """
+    Rebuild a project's archive, or wait for a rebuild already in progress.
+    
+    Returns the path of the zip archive.
+    """
+    build = _archive_builds.get(project_id)
+    if build is None:
+        loop = asyncio.get_running_loop()
+        build = loop.run_in_executor(ARCHIVE_EXECUTOR, _build_archive, project_id)
+        _archive_builds[project_id] = build
+        build.add_done_callback(lambda future: _finish_archive_build(project_id, future))
+    
+    # Shielded so a download that is cancelled does not cancel the rebuild
+    # other downloads are waiting for
+    return await asyncio.shield(build)
+
+def _finish_archive_build(project_id: str, build: "asyncio.Future[str]") -> None:
+    """Record a finished archive rebuild and cache its archive if it succeeded."""
+    del _archive_builds[project_id]
+    if not build.cancelled() and build.exception() is None:
+        _archive_cache.set(project_id, build.result(), ttl=ARCHIVE_CACHE_TTL)
+
+def _build_archive(project_id: str) -> str:
+    """
+    Regenerate a project's files and archive them.
+    
+    The files are zipped straight from memory rather than saved to disk and
+    read back, and files that are already compressed are stored as-is.
+    
+    Returns the path of the zip archive.
+    """
+    files = project_generator.get_project_files(project_id)
+    
+    os.makedirs(ARCHIVE_ROOT, exist_ok=True)
+    zip_path = os.path.join(ARCHIVE_ROOT, f"project_{project_id}.zip")
+    partial_path = f"{zip_path}.partial"
+    with zipfile.ZipFile(partial_path, "w", zipfile.ZIP_DEFLATED,
+                         compresslevel=ARCHIVE_COMPRESSLEVEL) as archive:
+        for path, content in files.items():
+            compress_type = (
+                zipfile.ZIP_STORED
+                if os.path.splitext(path)[1].lower() in COMPRESSED_EXTENSIONS
+                else zipfile.ZIP_DEFLATED
+            )
+            archive.writestr(path, content, compress_type=compress_type)
+    
+    # Publish the archive only once it is complete
+    os.replace(partial_path, zip_path)
+    return zip_path
+
+async def _cleanup_archives_periodically() -> None:
+    """Remove expired project archives every ARCHIVE_CLEANUP_INTERVAL seconds."""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(ARCHIVE_CLEANUP_INTERVAL)
+        try:
+            # Archives being built are newer than the cutoff, so are never removed
+            await loop.run_in_executor(ARCHIVE_EXECUTOR, _remove_expired_archives)
+        except Exception as e:
+            logger.error(f"Error removing expired project archives: {str(e)}")
+
+def _remove_expired_archives() -> None:
+    """
+    Remove rebuilt project archives, and leftovers of interrupted builds,
+    older than ARCHIVE_CACHE_TTL.
+    
+    Directories and archives saved during generation are the only copy of a
+    project's files, so they are left alone and only removed when the
+    project is deleted.
+    """
+    cutoff = time.time() - ARCHIVE_CACHE_TTL
+    for path in glob.glob(os.path.join(ARCHIVE_ROOT, "project_*.zip*")):
+        with contextlib.suppress(FileNotFoundError):
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+
 @app.post("/projects/sync", response_model=ProjectStatusResponse)
-def generate_project_sync(request: ProjectRequest, background_tasks: BackgroundTasks):
+async def generate_project_sync(request: ProjectRequest):
     """
     Generate a project synchronously (blocking operation).
     
     This endpoint will block until the project is generated.
     For large projects, use the asynchronous endpoint instead.
     """
+    temp_dir = tempfile.mkdtemp()
     try:
         # Generate project
-        temp_dir = tempfile.mkdtemp()
-        result = project_generator.generate_project(request.description, temp_dir)
-        
-        # Schedule cleanup of temporary files
-        background_tasks.add_task(
-            project_generator.output_manager.cleanup_temp_files, temp_dir
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            EXECUTOR, project_generator.generate_project, request.description, temp_dir
         )
         
+        # Clean up temporary files on the archive threads, outside the
+        # request's lifecycle and the server's shared thread pool
+        ARCHIVE_EXECUTOR.submit(project_generator.output_manager.cleanup_temp_files, temp_dir)
+        
         return {
             "project_id": result["project_id"],
             "status": "completed",
@@ -149,6 +323,7 @@ def generate_project_sync(request: ProjectRequest, background_tasks: BackgroundT
         }
     except Exception as e:
         logger.error(f"Error in synchronous project generation: {str(e)}")
+        ARCHIVE_EXECUTOR.submit(project_generator.output_manager.cleanup_temp_files, temp_dir)
         raise HTTPException(status_code=500, detail=str(e))
 
 # Run the API with: uvicorn src.interfaces.api:app --reload
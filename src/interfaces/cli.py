@@ -10,19 +10,22 @@ It handles argument parsing and orchestrates the project generation workflow.
 import sys
 import os
 import logging
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, Optional, List, Any
+from typing import TYPE_CHECKING, Dict, Optional, List, Any
 
 import typer
 from rich.console import Console
-from rich.logging import RichHandler
 
-from src.core.project_analyzer import ProjectAnalyzer
-from src.core.architecture_generator import ArchitectureGenerator
-from src.project_generator import ProjectGenerator
 from src.models.project_type import ProjectType
 from src.models.architecture_plan import ArchitecturePlan
 from src.config.config import Config
+from src.utils import json_utils
+
+if TYPE_CHECKING:
+    from src.core.architecture_generator import ArchitectureGenerator
+    from src.core.project_analyzer import ProjectAnalyzer
+    from src.project_generator import ProjectGenerator
 
 
 # Create Typer app instance
@@ -35,12 +38,22 @@ app = typer.Typer(
 # Set up rich console for better output
 console = Console()
 
+# Options shared by several commands
+DESCRIPTION_OPTION = typer.Option(None, "--description", "-d", help="Project description text")
+DESCRIPTION_FILE_OPTION = typer.Option(
+    None, "--description-file", "-f", help="Path to file containing project description, or - for stdin"
+)
+API_KEY_OPTION = typer.Option(
+    None, "--api-key", help="Anthropic API key (can also be set via ANTHROPIC_API_KEY env var)"
+)
+
 
 class CLI:
     """Command Line Interface for the Project Generator application.
 
     This class handles user input via command line arguments and orchestrates
-    the project generation workflow.
+    the project generation workflow. Components are imported and created on
+    first use, so each command only pays for the ones it needs.
     """
 
     def __init__(self, anthropic_api_key: Optional[str] = None) -> None:
@@ -54,11 +67,27 @@ class CLI:
         if anthropic_api_key:
             config.anthropic_api_key = anthropic_api_key
             
-        self.project_analyzer = ProjectAnalyzer(anthropic_api_key)
-        self.architecture_generator = ArchitectureGenerator(anthropic_api_key)
-        self.project_generator = ProjectGenerator()
+        self.anthropic_api_key = anthropic_api_key
         self.logger = logging.getLogger(__name__)
 
+    @cached_property
+    def project_analyzer(self) -> "ProjectAnalyzer":
+        """Project analyzer used by the analyze and architecture commands."""
+        from src.core.project_analyzer import ProjectAnalyzer
+        return ProjectAnalyzer(self.anthropic_api_key)
+
+    @cached_property
+    def architecture_generator(self) -> "ArchitectureGenerator":
+        """Architecture generator used by the architecture command."""
+        from src.core.architecture_generator import ArchitectureGenerator
+        return ArchitectureGenerator(self.anthropic_api_key)
+
+    @cached_property
+    def project_generator(self) -> "ProjectGenerator":
+        """Project generator used by the generate command."""
+        from src.project_generator import ProjectGenerator
+        return ProjectGenerator()
+
     def parse_arguments(self) -> Dict[str, Any]:
         """Parse command line arguments.
 
@@ -74,7 +103,8 @@ class CLI:
         
         Args:
             description: Project description text
-            description_file: Path to file containing description
+            description_file: Path to file containing description, or "-"
+                to read it from standard input
             
         Returns:
             str: Project description text
@@ -87,9 +117,10 @@ class CLI:
             return description
         
         if description_file:
+            if str(description_file) == "-":
+                return sys.stdin.read()
             try:
-                with open(description_file, "r", encoding="utf-8") as f:
-                    return f.read()
+                return Path(description_file).read_text(encoding="utf-8")
             except FileNotFoundError:
                 self.logger.error(f"Error: Description file '{description_file}' not found")
                 raise
@@ -148,10 +179,10 @@ class CLI:
 # Typer command handlers
 @app.command()
 def generate(
-    description: Optional[str] = typer.Option(None, "--description", "-d", help="Project description text"),
-    description_file: Optional[Path] = typer.Option(None, "--description-file", "-f", help="Path to file containing project description"),
+    description: Optional[str] = DESCRIPTION_OPTION,
+    description_file: Optional[Path] = DESCRIPTION_FILE_OPTION,
     output_dir: Path = typer.Option("./generated_project", "--output-dir", "-o", help="Directory to output the generated project"),
-    api_key: Optional[str] = typer.Option(None, "--api-key", help="Anthropic API key (can also be set via ANTHROPIC_API_KEY env var)"),
+    api_key: Optional[str] = API_KEY_OPTION,
     project_name: Optional[str] = typer.Option(None, "--name", "-n", help="Project name (defaults to directory name)")
 ):
     """Generate a complete project from a text description."""
@@ -183,9 +214,9 @@ def generate(
 
 @app.command()
 def analyze(
-    description: Optional[str] = typer.Option(None, "--description", "-d", help="Project description text"),
-    description_file: Optional[Path] = typer.Option(None, "--description-file", "-f", help="Path to file containing project description"),
-    api_key: Optional[str] = typer.Option(None, "--api-key", help="Anthropic API key (can also be set via ANTHROPIC_API_KEY env var)")
+    description: Optional[str] = DESCRIPTION_OPTION,
+    description_file: Optional[Path] = DESCRIPTION_FILE_OPTION,
+    api_key: Optional[str] = API_KEY_OPTION
 ):
     """Analyze a project description to determine type and requirements."""
     cli = CLI(api_key)
@@ -200,8 +231,7 @@ def analyze(
         project_desc = cli.get_project_description(description, description_file)
         
         # Analyze project
-        project_type = cli.project_analyzer.analyze_project_description(project_desc)
-        requirements = cli.project_analyzer.extract_key_requirements(project_desc)
+        project_type, requirements = cli.project_analyzer.analyze_project(project_desc)
         
         # Display results
         console.print(f"[bold green]Project Analysis:[/bold green]")
@@ -219,10 +249,10 @@ def analyze(
 
 @app.command()
 def architecture(
-    description: Optional[str] = typer.Option(None, "--description", "-d", help="Project description text"),
-    description_file: Optional[Path] = typer.Option(None, "--description-file", "-f", help="Path to file containing project description"),
+    description: Optional[str] = DESCRIPTION_OPTION,
+    description_file: Optional[Path] = DESCRIPTION_FILE_OPTION,
     output_file: Optional[Path] = typer.Option(None, "--output", "-o", help="File to output the generated architecture"),
-    api_key: Optional[str] = typer.Option(None, "--api-key", help="Anthropic API key (can also be set via ANTHROPIC_API_KEY env var)")
+    api_key: Optional[str] = API_KEY_OPTION
 ):
     """Generate an architecture plan for a project description."""
     cli = CLI(api_key)
@@ -237,8 +267,7 @@ def architecture(
         project_desc = cli.get_project_description(description, description_file)
         
         # Analyze project
-        project_type = cli.project_analyzer.analyze_project_description(project_desc)
-        requirements = cli.project_analyzer.extract_key_requirements(project_desc)
+        project_type, requirements = cli.project_analyzer.analyze_project(project_desc)
         
         # Generate architecture
         architecture_plan = cli.architecture_generator.generate_architecture(project_type, requirements)
@@ -259,9 +288,9 @@ def architecture(
             
         # Save to file if requested
         if output_file:
-            import json
-            with open(output_file, "w") as f:
-                json.dump(architecture_plan.to_dict(), f, indent=2)
+            Path(output_file).write_text(
+                json_utils.dumps(architecture_plan.to_dict(), indent=2), encoding="utf-8"
+            )
             console.print(f"\nArchitecture plan saved to [cyan]{output_file}[/cyan]")
             
     except Exception as e:
@@ -270,6 +299,8 @@ def architecture(
 
 
 if __name__ == "__main__":
+    from rich.logging import RichHandler
+    
     # Set up logging for CLI usage
     logging.basicConfig(
         level=logging.INFO,
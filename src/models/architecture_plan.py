@@ -8,9 +8,28 @@ This module defines classes related to the architecture plan of a project,
 including components, dependencies, and data flows.
 """
 
+import hashlib
+import sys
+from collections import defaultdict
+from functools import cached_property
+from operator import itemgetter
 from typing import List, Dict, Any, Optional
 from src.models.project_type import ProjectType
 
+# Defaults of the fields read by each from_dict, in constructor order, and
+# getters reading those fields in one call
+_COMPONENT_DEFAULTS: Dict[str, Any] = {"name": "", "purpose": "", "responsibilities": "", "technologies": ""}
+_DEPENDENCY_DEFAULTS: Dict[str, Any] = {"source": "", "target": "", "type": "uses", "description": ""}
+_DATA_FLOW_DEFAULTS: Dict[str, Any] = {"source": "", "target": "", "data_description": "", "protocol": None}
+_get_component_fields = itemgetter(*_COMPONENT_DEFAULTS)
+_get_dependency_fields = itemgetter(*_DEPENDENCY_DEFAULTS)
+_get_data_flow_fields = itemgetter(*_DATA_FLOW_DEFAULTS)
+
+
+def _intern(value: Any) -> Any:
+    """Intern a string drawn from a small vocabulary, so equal values share one object."""
+    return sys.intern(value) if isinstance(value, str) else value
+
 
 class Component:
     """
@@ -23,6 +42,8 @@ class Component:
         technologies: The technologies used by the component
     """
     
+    __slots__ = ("name", "purpose", "responsibilities", "technologies")
+    
     def __init__(
         self,
         name: str,
@@ -42,7 +63,7 @@ class Component:
         self.name = name
         self.purpose = purpose
         self.responsibilities = responsibilities
-        self.technologies = technologies
+        self.technologies = _intern(technologies)
     
     def __str__(self) -> str:
         """Get string representation of the component."""
@@ -71,12 +92,7 @@ class Component:
         Returns:
             A new Component instance
         """
-        return cls(
-            name=data.get("name", ""),
-            purpose=data.get("purpose", ""),
-            responsibilities=data.get("responsibilities", ""),
-            technologies=data.get("technologies", "")
-        )
+        return cls(*_get_component_fields({**_COMPONENT_DEFAULTS, **data}))
 
 
 class Dependency:
@@ -90,6 +106,8 @@ class Dependency:
         description: Description of the dependency
     """
     
+    __slots__ = ("source", "target", "type", "description")
+    
     def __init__(
         self,
         source: str,
@@ -108,7 +126,7 @@ class Dependency:
         """
         self.source = source
         self.target = target
-        self.type = type
+        self.type = _intern(type)
         self.description = description
     
     def __str__(self) -> str:
@@ -138,12 +156,7 @@ class Dependency:
         Returns:
             A new Dependency instance
         """
-        return cls(
-            source=data.get("source", ""),
-            target=data.get("target", ""),
-            type=data.get("type", "uses"),
-            description=data.get("description", "")
-        )
+        return cls(*_get_dependency_fields({**_DEPENDENCY_DEFAULTS, **data}))
 
 
 class DataFlow:
@@ -157,6 +170,8 @@ class DataFlow:
         protocol: The protocol used for the data transfer
     """
     
+    __slots__ = ("source", "target", "data_description", "protocol")
+    
     def __init__(
         self,
         source: str,
@@ -176,7 +191,7 @@ class DataFlow:
         self.source = source
         self.target = target
         self.data_description = data_description
-        self.protocol = protocol
+        self.protocol = _intern(protocol)
     
     def __str__(self) -> str:
         """Get string representation of the data flow."""
@@ -209,12 +224,7 @@ class DataFlow:
         Returns:
             A new DataFlow instance
         """
-        return cls(
-            source=data.get("source", ""),
-            target=data.get("target", ""),
-            data_description=data.get("data_description", ""),
-            protocol=data.get("protocol")
-        )
+        return cls(*_get_data_flow_fields({**_DATA_FLOW_DEFAULTS, **data}))
 
 
 class ArchitecturePlan:
@@ -227,6 +237,10 @@ class ArchitecturePlan:
         dependencies: List of dependencies between components
         data_flows: List of data flows between components
         description: Description of the architecture plan
+    
+    Lookups by component name use indices built on first use. Assigning new
+    components or dependencies rebuilds them; lists mutated in place must be
+    reassigned for lookups to see the change.
     """
     
     def __init__(
@@ -247,12 +261,48 @@ class ArchitecturePlan:
             data_flows: List of data flows between components
             description: Description of the architecture plan
         """
+        self._name_index: Optional[Dict[str, Component]] = None
+        self._deps_by_source: Optional[Dict[str, List[Dependency]]] = None
+        self._deps_by_target: Optional[Dict[str, List[str]]] = None
         self.project_type = project_type
         self.components = components
         self.dependencies = dependencies
         self.data_flows = data_flows
         self.description = description
     
+    @property
+    def components(self) -> List[Component]:
+        """The components in the architecture."""
+        return self._components
+    
+    @components.setter
+    def components(self, components: List[Component]) -> None:
+        self._components = components
+        self._name_index = None
+        self.__dict__.pop("components_as_dicts", None)
+    
+    @property
+    def dependencies(self) -> List[Dependency]:
+        """The dependencies between components."""
+        return self._dependencies
+    
+    @dependencies.setter
+    def dependencies(self, dependencies: List[Dependency]) -> None:
+        self._dependencies = dependencies
+        self._deps_by_source = None
+        self._deps_by_target = None
+        self.__dict__.pop("dependencies_as_dicts", None)
+    
+    @property
+    def data_flows(self) -> List[DataFlow]:
+        """The data flows between components."""
+        return self._data_flows
+    
+    @data_flows.setter
+    def data_flows(self, data_flows: List[DataFlow]) -> None:
+        self._data_flows = data_flows
+        self.__dict__.pop("data_flows_as_dicts", None)
+    
     def __str__(self) -> str:
         """Get string representation of the architecture plan."""
         return f"Architecture plan for {self.project_type} with {len(self.components)} components"
@@ -271,6 +321,43 @@ class ArchitecturePlan:
             "description": self.description
         }
     
+    @cached_property
+    def components_as_dicts(self) -> List[Dict[str, Any]]:
+        """The components in dictionary form, computed once per plan.
+        
+        Shared by every stage that serializes the plan, so the dictionaries
+        must not be modified.
+        """
+        return [comp.to_dict() for comp in self.components]
+    
+    @cached_property
+    def dependencies_as_dicts(self) -> List[Dict[str, Any]]:
+        """The dependencies in dictionary form, computed once per plan."""
+        return [dep.to_dict() for dep in self.dependencies]
+    
+    @cached_property
+    def data_flows_as_dicts(self) -> List[Dict[str, Any]]:
+        """The data flows in dictionary form, computed once per plan."""
+        return [flow.to_dict() for flow in self.data_flows]
+    
+    def content_hash(self) -> str:
+        """Get a hash of the architecture plan's content.
+        
+        Cheaper to compute than a serialized plan, so it can key caches of
+        results derived from the plan.
+        
+        Returns:
+            Hex-encoded SHA-256 digest of the plan's content
+        """
+        content = (
+            self.project_type.to_dict(),
+            [(comp.name, comp.purpose, comp.responsibilities, comp.technologies) for comp in self.components],
+            [(dep.source, dep.target, dep.type, dep.description) for dep in self.dependencies],
+            [(flow.source, flow.target, flow.data_description, flow.protocol) for flow in self.data_flows],
+            self.description
+        )
+        return hashlib.sha256(repr(content).encode("utf-8")).hexdigest()
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ArchitecturePlan':
         """Create an ArchitecturePlan instance from a dictionary.
@@ -283,20 +370,9 @@ class ArchitecturePlan:
         """
         project_type = ProjectType.from_dict(data.get("project_type", {}))
         
-        components = [
-            Component.from_dict(comp_data)
-            for comp_data in data.get("components", [])
-        ]
-        
-        dependencies = [
-            Dependency.from_dict(dep_data)
-            for dep_data in data.get("dependencies", [])
-        ]
-        
-        data_flows = [
-            DataFlow.from_dict(flow_data)
-            for flow_data in data.get("data_flows", [])
-        ]
+        components = list(map(Component.from_dict, data.get("components", ())))
+        dependencies = list(map(Dependency.from_dict, data.get("dependencies", ())))
+        data_flows = list(map(DataFlow.from_dict, data.get("data_flows", ())))
         
         return cls(
             project_type=project_type,
@@ -315,10 +391,12 @@ class ArchitecturePlan:
         Returns:
             The component with the specified name, or None if not found
         """
-        for component in self.components:
-            if component.name == name:
-                return component
-        return None
+        if self._name_index is None:
+            self._name_index = {}
+            for component in self.components:
+                # The first component wins, as with a linear scan
+                self._name_index.setdefault(component.name, component)
+        return self._name_index.get(name)
     
     def get_dependencies_for_component(self, component_name: str) -> List[Dependency]:
         """Get all dependencies where a component is the source.
@@ -329,7 +407,9 @@ class ArchitecturePlan:
         Returns:
             List of dependencies where the component is the source
         """
-        return [dep for dep in self.dependencies if dep.source == component_name]
+        if self._deps_by_source is None:
+            self._build_dependency_indices()
+        return list(self._deps_by_source.get(component_name, ()))
     
     def get_dependent_components(self, component_name: str) -> List[str]:
         """Get the names of components that depend on a specified component.
@@ -340,4 +420,16 @@ class ArchitecturePlan:
         Returns:
             List of names of components that depend on the specified component
         """
-        return [dep.source for dep in self.dependencies if dep.target == component_name]
+        if self._deps_by_target is None:
+            self._build_dependency_indices()
+        return list(self._deps_by_target.get(component_name, ()))
+    
+    def _build_dependency_indices(self) -> None:
+        """Index the dependencies by source and by target component."""
+        deps_by_source: Dict[str, List[Dependency]] = defaultdict(list)
+        deps_by_target: Dict[str, List[str]] = defaultdict(list)
+        for dep in self.dependencies:
+            deps_by_source[dep.source].append(dep)
+            deps_by_target[dep.target].append(dep.source)
+        self._deps_by_source = dict(deps_by_source)
+        self._deps_by_target = dict(deps_by_target)
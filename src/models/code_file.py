@@ -8,8 +8,43 @@ This module defines the CodeFile class, which represents a generated
 code file in the project.
 """
 
+import os
+import sys
 from typing import List, Dict, Any, Optional
-from pathlib import Path
+
+# Map of file extensions to languages
+LANGUAGE_MAP: Dict[str, str] = {
+    ".py": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".html": "html",
+    ".css": "css",
+    ".scss": "scss",
+    ".sass": "sass",
+    ".less": "less",
+    ".json": "json",
+    ".md": "markdown",
+    ".yml": "yaml",
+    ".yaml": "yaml",
+    ".java": "java",
+    ".c": "c",
+    ".cpp": "cpp",
+    ".h": "c",
+    ".hpp": "cpp",
+    ".cs": "csharp",
+    ".go": "go",
+    ".rs": "rust",
+    ".rb": "ruby",
+    ".php": "php",
+    ".swift": "swift",
+    ".kt": "kotlin",
+    ".sh": "shell",
+    ".bat": "batch",
+    ".ps1": "powershell",
+    ".sql": "sql",
+}
 
 
 class CodeFile:
@@ -24,6 +59,8 @@ class CodeFile:
         dependencies: List of other files this file depends on
     """
     
+    __slots__ = ("path", "content", "language", "description", "dependencies")
+    
     def __init__(
         self,
         path: str,
@@ -44,7 +81,9 @@ class CodeFile:
         """
         self.path = path
         self.content = content
-        self.language = language or self._infer_language(path)
+        # Languages come from a small vocabulary, so equal values share one
+        # string; inferred ones are already the map's interned literals
+        self.language = sys.intern(language) if language else self._infer_language(path)
         self.description = description
         self.dependencies = dependencies or []
     
@@ -61,43 +100,12 @@ class CodeFile:
         Returns:
             The inferred programming language
         """
-        extension = Path(path).suffix.lower()
-        
-        # Map of file extensions to languages
-        language_map = {
-            ".py": "python",
-            ".js": "javascript",
-            ".jsx": "javascript",
-            ".ts": "typescript",
-            ".tsx": "typescript",
-            ".html": "html",
-            ".css": "css",
-            ".scss": "scss",
-            ".sass": "sass",
-            ".less": "less",
-            ".json": "json",
-            ".md": "markdown",
-            ".yml": "yaml",
-            ".yaml": "yaml",
-            ".java": "java",
-            ".c": "c",
-            ".cpp": "cpp",
-            ".h": "c",
-            ".hpp": "cpp",
-            ".cs": "csharp",
-            ".go": "go",
-            ".rs": "rust",
-            ".rb": "ruby",
-            ".php": "php",
-            ".swift": "swift",
-            ".kt": "kotlin",
-            ".sh": "shell",
-            ".bat": "batch",
-            ".ps1": "powershell",
-            ".sql": "sql",
-        }
-        
-        return language_map.get(extension, "text")
+        dot = path.rfind(".")
+        # A dot in a directory name or leading the file name (a dotfile)
+        # does not start an extension
+        if dot <= max(path.rfind("/"), path.rfind("\\")) + 1:
+            return "text"
+        return LANGUAGE_MAP.get(path[dot:].lower(), "text")
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert the code file to a dictionary.
@@ -138,7 +146,7 @@ class CodeFile:
         Returns:
             The filename
         """
-        return Path(self.path).name
+        return os.path.basename(self.path)
     
     @property
     def extension(self) -> str:
@@ -147,7 +155,7 @@ class CodeFile:
         Returns:
             The file extension (including the dot)
         """
-        return Path(self.path).suffix
+        return os.path.splitext(self.path)[1]
     
     def update_content(self, new_content: str) -> None:
         """Update the content of the file.
@@ -8,7 +8,16 @@ This module defines the DependencySpec class, which represents a
 dependency specification for a project.
 """
 
-from typing import List, Dict, Any, Optional, Literal
+import re
+import sys
+from typing import List, Dict, Any, Optional, Literal, Pattern
+
+# Splits a dependency string at its first version operator into the name,
+# the operator and the version
+DEPENDENCY_STRING_PATTERN: Pattern[str] = re.compile(r"(.*?)(==|>=|<=|~=|>|<)(.*)", re.DOTALL)
+
+# First characters of versions that npm already reads as a range or exact version
+NPM_RANGE_PREFIXES = frozenset("^~><=")
 
 
 class DependencySpec:
@@ -22,6 +31,8 @@ class DependencySpec:
         purpose: Description of why the dependency is needed
     """
     
+    __slots__ = ("name", "version", "type", "purpose")
+    
     def __init__(
         self,
         name: str,
@@ -40,7 +51,7 @@ class DependencySpec:
         """
         self.name = name
         self.version = version
-        self.type = type
+        self.type = sys.intern(type) if isinstance(type, str) else type
         self.purpose = purpose
     
     def __str__(self) -> str:
@@ -89,26 +100,16 @@ class DependencySpec:
         Returns:
             A new DependencySpec instance
         """
-        if "==" in dependency_string:
-            name, version = dependency_string.split("==", 1)
-            return cls(name=name.strip(), version=version.strip())
-        elif ">=" in dependency_string:
-            name, version = dependency_string.split(">=", 1)
-            return cls(name=name.strip(), version=f">={version.strip()}")
-        elif "<=" in dependency_string:
-            name, version = dependency_string.split("<=", 1)
-            return cls(name=name.strip(), version=f"<={version.strip()}")
-        elif ">" in dependency_string:
-            name, version = dependency_string.split(">", 1)
-            return cls(name=name.strip(), version=f">{version.strip()}")
-        elif "<" in dependency_string:
-            name, version = dependency_string.split("<", 1)
-            return cls(name=name.strip(), version=f"<{version.strip()}")
-        elif "~=" in dependency_string:
-            name, version = dependency_string.split("~=", 1)
-            return cls(name=name.strip(), version=f"~={version.strip()}")
-        else:
+        match = DEPENDENCY_STRING_PATTERN.match(dependency_string)
+        if match is None:
             return cls(name=dependency_string.strip())
+        
+        name, operator, version = match.groups()
+        version = version.strip()
+        # An exact version is stored without its operator
+        if operator != "==":
+            version = f"{operator}{version}"
+        return cls(name=name.strip(), version=version)
     
     def to_requirement_string(self) -> str:
         """Convert the dependency specification to a requirements.txt string.
@@ -127,25 +128,14 @@ class DependencySpec:
             Dictionary entry for package.json
         """
         if self.version:
-            # Handle different version specifiers
-            if self.version.startswith(">="):
-                version = self.version
-            elif self.version.startswith("<="):
-                version = self.version
-            elif self.version.startswith(">"):
-                version = self.version
-            elif self.version.startswith("<"):
-                version = self.version
-            elif self.version.startswith("~="):
+            if self.version[:2] == "~=":
                 # Convert Python's ~= to npm's ~
                 version = "~" + self.version[2:]
-            else:
-                # Default to exact version
+            elif self.version[:1] in NPM_RANGE_PREFIXES:
                 version = self.version
-            
-            # If version has no prefix, add ^ for npm
-            if not any(version.startswith(p) for p in ["^", "~", ">", "<", "="]):
-                version = f"^{version}"
+            else:
+                # If version has no prefix, add ^ for npm
+                version = f"^{self.version}"
             
             return {self.name: version}
         else:
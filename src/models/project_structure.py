@@ -8,8 +8,11 @@ This module defines classes related to the structure of a project,
 including file and directory nodes.
 """
 
-from typing import List, Dict, Any, Optional, Union
-from pathlib import Path
+import os
+import sys
+from functools import cached_property
+from pathlib import PurePosixPath
+from typing import List, Dict, Any, Optional, Tuple, Union
 
 
 class FileNode:
@@ -23,6 +26,11 @@ class FileNode:
         components: List of components implemented in the file
     """
     
+    __slots__ = ("path", "description", "content", "components")
+    
+    # Lets tree traversals tell files from directories without isinstance
+    IS_DIR = False
+    
     def __init__(
         self,
         path: str,
@@ -87,7 +95,7 @@ class FileNode:
         Returns:
             The filename
         """
-        return Path(self.path).name
+        return os.path.basename(self.path)
     
     @property
     def extension(self) -> str:
@@ -96,7 +104,7 @@ class FileNode:
         Returns:
             The file extension (including the dot)
         """
-        return Path(self.path).suffix
+        return os.path.splitext(self.path)[1]
 
 
 class DirectoryNode:
@@ -109,6 +117,10 @@ class DirectoryNode:
         children: List of child nodes (files and directories)
     """
     
+    __slots__ = ("path", "description", "children")
+    
+    IS_DIR = True
+    
     def __init__(
         self,
         path: str,
@@ -192,7 +204,7 @@ class DirectoryNode:
         Returns:
             List of file nodes
         """
-        return [child for child in self.children if isinstance(child, FileNode)]
+        return [child for child in self.children if not child.IS_DIR]
     
     def get_directories(self) -> List['DirectoryNode']:
         """Get all directory nodes in the directory.
@@ -200,7 +212,7 @@ class DirectoryNode:
         Returns:
             List of directory nodes
         """
-        return [child for child in self.children if isinstance(child, DirectoryNode)]
+        return [child for child in self.children if child.IS_DIR]
     
     def find_file(self, path: str) -> Optional[FileNode]:
         """Find a file node by path.
@@ -211,15 +223,19 @@ class DirectoryNode:
         Returns:
             The file node with the specified path, or None if not found
         """
-        for child in self.children:
-            if isinstance(child, FileNode) and child.path == path:
-                return child
-            elif isinstance(child, DirectoryNode):
-                # Check if the path starts with this directory's path
-                if path.startswith(child.path + "/"):
-                    result = child.find_file(path)
-                    if result:
-                        return result
+        # Depth-first, in child order, descending only into directories
+        # whose path is a prefix of the searched path
+        stack = [self]
+        while stack:
+            directory = stack.pop()
+            subdirectories = []
+            for child in directory.children:
+                if child.IS_DIR:
+                    if path.startswith(child.path + "/"):
+                        subdirectories.append(child)
+                elif child.path == path:
+                    return child
+            stack.extend(reversed(subdirectories))
         return None
 
 
@@ -250,50 +266,67 @@ class ProjectStructure:
             directories: List of directories in the project
             files: List of file descriptors in the project
         """
-        self.project_type = project_type
+        self.project_type = sys.intern(project_type) if isinstance(project_type, str) else project_type
         self.description = description
         self.directories = directories or []
         self.files = files or []
-        self._root = self._build_tree()
     
-    def _build_tree(self) -> DirectoryNode:
+    @cached_property
+    def _tree(self) -> Tuple[DirectoryNode, Dict[str, FileNode]]:
+        """The directory tree and file index, built on first use.
+        
+        Callers that only need the flat lists, such as to_dict, never pay
+        for building the tree.
+        """
+        return self._build_tree()
+    
+    def _build_tree(self) -> Tuple[DirectoryNode, Dict[str, FileNode]]:
         """Build a directory tree from the flat structure.
         
         Returns:
-            The root directory node
+            Tuple of the root directory node and an index of the file
+            nodes by path
         """
         root = DirectoryNode(".", "Project root")
+        file_index: Dict[str, FileNode] = {}
         
         # Create directory nodes
-        dir_nodes = {}
+        dir_nodes: Dict[str, DirectoryNode] = {}
         for dir_path in self.directories:
-            parts = dir_path.split("/")
-            current_path = ""
+            if dir_path in dir_nodes:
+                continue
+            
+            # Walk up only as far as the deepest ancestor already created,
+            # so shared prefixes are not scanned again for every directory
+            missing_paths = [dir_path]
+            parent_path = dir_path.rpartition("/")[0]
+            while parent_path and parent_path not in dir_nodes:
+                missing_paths.append(parent_path)
+                parent_path = parent_path.rpartition("/")[0]
             
-            for i, part in enumerate(parts):
-                parent_path = current_path
-                current_path = current_path + ("/" if current_path else "") + part
-                
-                if current_path not in dir_nodes:
-                    dir_node = DirectoryNode(current_path)
-                    dir_nodes[current_path] = dir_node
-                    
-                    if i > 0 and parent_path in dir_nodes:
-                        dir_nodes[parent_path].add_directory(dir_node)
-                    elif i == 0:
-                        root.add_directory(dir_node)
+            parent_node = dir_nodes[parent_path] if parent_path else root
+            for path in reversed(missing_paths):
+                dir_node = DirectoryNode(path)
+                dir_nodes[path] = dir_node
+                parent_node.add_directory(dir_node)
+                parent_node = dir_node
         
         # Create file nodes
         for file_info in self.files:
             file_path = file_info.get("path", "")
+            # Positional arguments (path, description, content, components)
+            # are cheaper to pass than keywords in this per-file loop
             file_node = FileNode(
-                path=file_path,
-                description=file_info.get("description", ""),
-                components=file_info.get("components", [])
+                file_path, file_info.get("description", ""), None, file_info.get("components", [])
             )
+            file_index.setdefault(file_path, file_node)
             
-            # Find the parent directory
-            parent_path = str(Path(file_path).parent)
+            # Find the parent directory; irregular paths such as "./src/x.py"
+            # or "src//x.py" are normalized the way pathlib does
+            if "//" in file_path or "./" in file_path:
+                parent_path = str(PurePosixPath(file_path).parent)
+            else:
+                parent_path = file_path.rpartition("/")[0] or "."
             if parent_path == ".":
                 # File is in the root directory
                 root.add_file(file_node)
@@ -303,7 +336,7 @@ class ProjectStructure:
                 # Parent directory doesn't exist, add to root
                 root.add_file(file_node)
         
-        return root
+        return root, file_index
     
     @property
     def root(self) -> DirectoryNode:
@@ -312,7 +345,7 @@ class ProjectStructure:
         Returns:
             The root directory node
         """
-        return self._root
+        return self._tree[0]
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert the project structure to a dictionary.
@@ -347,13 +380,16 @@ class ProjectStructure:
     def find_file(self, path: str) -> Optional[FileNode]:
         """Find a file node by path.
         
+        Uses an index of the files the tree was built from, so nodes added
+        to the tree afterwards are not found.
+        
         Args:
             path: The path to find
             
         Returns:
             The file node with the specified path, or None if not found
         """
-        return self._root.find_file(path)
+        return self._tree[1].get(path)
     
     def get_all_files(self) -> List[FileNode]:
         """Get all file nodes in the project.
@@ -361,17 +397,7 @@ class ProjectStructure:
         Returns:
             List of all file nodes
         """
-        result = []
-        
-        def collect_files(node: Union[DirectoryNode, FileNode]) -> None:
-            if isinstance(node, FileNode):
-                result.append(node)
-            elif isinstance(node, DirectoryNode):
-                for child in node.children:
-                    collect_files(child)
-        
-        collect_files(self._root)
-        return result
+        return [node for node in self.get_all_nodes() if not node.IS_DIR]
     
     def get_all_nodes(self) -> List[Union[DirectoryNode, FileNode]]:
         """Get all nodes (files and directories) in the project.
@@ -380,12 +406,11 @@ class ProjectStructure:
             List of all nodes
         """
         result = []
-        
-        def collect_nodes(node: Union[DirectoryNode, FileNode]) -> None:
+        # Children are pushed in reverse so nodes come out in depth-first order
+        stack: List[Union[DirectoryNode, FileNode]] = [self.root]
+        while stack:
+            node = stack.pop()
             result.append(node)
-            if isinstance(node, DirectoryNode):
-                for child in node.children:
-                    collect_nodes(child)
-        
-        collect_nodes(self._root)
+            if node.IS_DIR:
+                stack.extend(reversed(node.children))
         return result
@@ -35,6 +35,10 @@ class ProjectTypeEnum(Enum):
     GENERIC = auto()
 
 
+# Project types by enumeration name, for lookups that fall back to a default
+_PROJECT_TYPES_BY_NAME: Dict[str, ProjectTypeEnum] = dict(ProjectTypeEnum.__members__)
+
+
 class ProjectType:
     """
     Represents the type and characteristics of a project.
@@ -47,6 +51,8 @@ class ProjectType:
         technologies: List of technologies associated with the project type
     """
     
+    __slots__ = ("type_enum", "name", "subtypes", "description", "technologies")
+    
     def __init__(
         self,
         type_enum: ProjectTypeEnum,
@@ -98,12 +104,8 @@ class ProjectType:
         Returns:
             A new ProjectType instance
         """
-        type_name = data.get("type", "").upper()
-        try:
-            type_enum = ProjectTypeEnum[type_name]
-        except KeyError:
-            # Default to GENERIC if type is not recognized
-            type_enum = ProjectTypeEnum.GENERIC
+        # Default to GENERIC if type is not recognized
+        type_enum = _PROJECT_TYPES_BY_NAME.get(data.get("type", "").upper(), ProjectTypeEnum.GENERIC)
         
         return cls(
             type_enum=type_enum,
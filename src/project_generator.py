@@ -1,17 +1,38 @@
-import uuid
+import os
+import shutil
 import logging
 import asyncio
-from typing import Dict, Any, Optional, List, Tuple
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import cached_property
+from secrets import token_hex
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Set, Tuple
 
-# Updated imports to match the actual project structure
-from src.core.project_analyzer import ProjectAnalyzer
-from src.core.architecture_generator import ArchitectureGenerator
-from src.core.project_structure_generator import ProjectStructureGenerator
-from src.core.code_generator import CodeGenerator
-from src.core.dependency_manager import DependencyManager
-from src.output.project_output_manager import ProjectOutputManager
+from src.clients.llm_cache import InMemoryLRUCache, make_cache_key
 from src.models.project_type import ProjectType, ProjectTypeEnum
 
+if TYPE_CHECKING:
+    from src.clients.anthropic_client import AnthropicClient
+    from src.core.architecture_generator import ArchitectureGenerator
+    from src.core.code_generator import CodeGenerator
+    from src.core.dependency_manager import DependencyManager
+    from src.core.project_analyzer import ProjectAnalyzer
+    from src.core.project_structure_generator import ProjectStructureGenerator
+    from src.output.project_output_manager import ProjectOutputManager
+
+# Directory under which asynchronously generated projects are saved and archived
+ARCHIVE_ROOT = os.path.join(tempfile.gettempdir(), "project_architect")
+
+# Number of descriptions whose generated contents are kept for reuse
+PROJECT_CACHE_SIZE = 128
+
+# Seconds generated contents are reused, matching the default lifetime of the
+# cached Claude responses they were built from
+PROJECT_CACHE_TTL = 3600
+
 class ProjectGenerator:
     """
     Facade that coordinates the entire project generation process.
@@ -19,15 +40,65 @@ class ProjectGenerator:
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.project_analyzer = ProjectAnalyzer()
-        self.architecture_generator = ArchitectureGenerator()
-        self.structure_generator = ProjectStructureGenerator()
-        self.code_generator = CodeGenerator()
-        self.dependency_manager = DependencyManager()
-        self.output_manager = ProjectOutputManager()
+        # Response cache shared by the components, so retried projects reuse
+        # responses. The components themselves are created on first use, so
+        # callers that only look up projects do not pay for building them
+        self.llm_cache = InMemoryLRUCache()
         
         # Store in-progress and completed projects
         self.projects = {}
+        
+        # Running background generation tasks; the event loop only keeps weak
+        # references to tasks, so they are held here until they finish
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        
+        # Generated contents and their expiry time by description, most
+        # recently used last
+        self._contents_cache: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._contents_lock = threading.Lock()
+    
+    @cached_property
+    def anthropic_client(self) -> "AnthropicClient":
+        """Client shared by the components, so they reuse connections and the response cache."""
+        from src.clients.anthropic_client import AnthropicClient
+        from src.config.config import Config
+        return AnthropicClient(Config(), cache=self.llm_cache)
+    
+    @cached_property
+    def project_analyzer(self) -> "ProjectAnalyzer":
+        """Project analyzer for step 1."""
+        from src.core.project_analyzer import ProjectAnalyzer
+        return ProjectAnalyzer(anthropic_client=self.anthropic_client)
+    
+    @cached_property
+    def architecture_generator(self) -> "ArchitectureGenerator":
+        """Architecture generator for step 2."""
+        from src.core.architecture_generator import ArchitectureGenerator
+        return ArchitectureGenerator(anthropic_client=self.anthropic_client)
+    
+    @cached_property
+    def structure_generator(self) -> "ProjectStructureGenerator":
+        """Project structure generator for step 3."""
+        from src.core.project_structure_generator import ProjectStructureGenerator
+        return ProjectStructureGenerator(anthropic_client=self.anthropic_client)
+    
+    @cached_property
+    def dependency_manager(self) -> "DependencyManager":
+        """Dependency manager for steps 4 and 5."""
+        from src.core.dependency_manager import DependencyManager
+        return DependencyManager(anthropic_client=self.anthropic_client)
+    
+    @cached_property
+    def code_generator(self) -> "CodeGenerator":
+        """Code generator for step 6."""
+        from src.core.code_generator import CodeGenerator
+        return CodeGenerator(anthropic_client=self.anthropic_client)
+    
+    @cached_property
+    def output_manager(self) -> "ProjectOutputManager":
+        """Output manager archiving saved projects."""
+        from src.output.project_output_manager import ProjectOutputManager
+        return ProjectOutputManager()
     
     def generate_project(self, description: str, output_dir: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -43,61 +114,51 @@ class ProjectGenerator:
         self.logger.info(f"Starting project generation from description: {description[:100]}...")
         
         try:
-            # Step 1: Analyze project description
-            project_type_str, requirements = self.project_analyzer.analyze(description)
-            self.logger.info(f"Project analyzed as type: {project_type_str}")
-            
-            # Convert string project type to ProjectType object
-            try:
-                project_type_enum = ProjectTypeEnum[project_type_str.upper()]
-                project_type = ProjectType(
-                    type_enum=project_type_enum,
-                    name=project_type_str,
-                    description=f"Project type derived from description: {description[:50]}..."
-                )
-            except KeyError:
-                self.logger.error(f"Unsupported project type: {project_type_str}")
-                raise ValueError(f"Unsupported project type: {project_type_str}")
-            
-            # Step 2: Generate architecture plan
-            architecture_plan = self.architecture_generator.generate_architecture(
-                project_type, requirements
-            )
-            self.logger.info("Architecture plan generated")
-            
-            # Step 3: Generate project structure
-            project_structure = self.structure_generator.generate_structure(architecture_plan)
-            self.logger.info("Project structure generated")
+            # The pipeline's output depends only on the description, so a
+            # description repeated within PROJECT_CACHE_TTL reuses the earlier
+            # output. The contents are never modified once generated, so
+            # projects with the same description share them instead of each
+            # holding its own copy
+            cache_key = make_cache_key(task="project", description=description)
+            cached_contents = None
+            with self._contents_lock:
+                entry = self._contents_cache.get(cache_key)
+                if entry is not None:
+                    if entry[1] > time.time():
+                        cached_contents = entry[0]
+                        self._contents_cache.move_to_end(cache_key)
+                    else:
+                        del self._contents_cache[cache_key]
             
-            # Step 4: Generate code files
-            code_files = self.code_generator.generate_code(project_structure, architecture_plan)
-            self.logger.info(f"Generated {len(code_files)} code files")
-            
-            # Step 5: Determine project dependencies
-            dependencies = self.dependency_manager.determine_dependencies(
-                project_type_str, architecture_plan
-            )
-            self.logger.info(f"Determined {len(dependencies)} dependencies")
-            
-            # Step 6: Add dependency files to the project
-            dependency_files = self.dependency_manager.generate_dependency_files(dependencies)
-            all_files = {**code_files, **dependency_files}
+            if cached_contents is not None:
+                self.logger.info("Reusing project contents generated for the same description")
+                contents = cached_contents
+            else:
+                contents = self._generate_contents(description)
+                with self._contents_lock:
+                    self._contents_cache[cache_key] = (contents, time.time() + PROJECT_CACHE_TTL)
+                    self._contents_cache.move_to_end(cache_key)
+                    while len(self._contents_cache) > PROJECT_CACHE_SIZE:
+                        self._contents_cache.popitem(last=False)
+            all_files = contents["files"]
             
             # Step 7: Save project files if output directory is provided
+            archive_path = None
             if output_dir:
-                self.output_manager.save_project_files(all_files, output_dir)
+                self._save_files(all_files, output_dir)
                 archive_path = self.output_manager.create_project_archive(output_dir)
                 self.logger.info(f"Project saved to {archive_path}")
             
             # Prepare result
             result = {
-                "project_id": str(uuid.uuid4()),
-                "project_type": project_type_str,
-                "architecture": architecture_plan,
-                "structure": project_structure,
+                "project_id": token_hex(16),
+                "project_type": contents["project_type"],
+                "architecture": contents["architecture"],
+                "structure": contents["structure"],
                 "files": list(all_files.keys()),
-                "dependencies": dependencies,
+                "dependencies": contents["dependencies"],
                 "output_dir": output_dir,
+                "archive_path": archive_path,
                 "status": "completed"
             }
             
@@ -110,17 +171,122 @@ class ProjectGenerator:
             self.logger.error(f"Error generating project: {str(e)}")
             raise RuntimeError(f"Project generation failed: {str(e)}") from e
     
-    async def generate_project_async(self, description: str) -> str:
+    def _generate_contents(self, description: str) -> Dict[str, Any]:
+        """
+        Run the generation pipeline up to, but not including, saving files.
+        
+        Args:
+            description: User's description of the project
+            
+        Returns:
+            Dictionary with the project type name, architecture plan,
+            project structure, dependencies, and files mapping paths to content
+        """
+        # Step 1: Analyze project description
+        project_type_str, requirements = self.project_analyzer.analyze(description)
+        self.logger.info(f"Project analyzed as type: {project_type_str}")
+        
+        # Convert string project type to ProjectType object
+        try:
+            project_type_enum = ProjectTypeEnum[project_type_str.upper()]
+            project_type = ProjectType(
+                type_enum=project_type_enum,
+                name=project_type_str,
+                description=f"Project type derived from description: {description[:50]}..."
+            )
+        except KeyError:
+            self.logger.error(f"Unsupported project type: {project_type_str}")
+            raise ValueError(f"Unsupported project type: {project_type_str}")
+        
+        # Step 2: Generate architecture plan
+        architecture_plan = self.architecture_generator.generate_architecture(
+            project_type, requirements
+        )
+        self.logger.info("Architecture plan generated")
+        
+        # Steps 3 and 4 only depend on the architecture plan, so the
+        # dependencies are determined while the structure is generated
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            dependencies_future = executor.submit(
+                self.dependency_manager.determine_dependencies,
+                project_type_str, architecture_plan
+            )
+            
+            # Step 3: Generate project structure
+            project_structure = self.structure_generator.generate_structure(architecture_plan)
+            self.logger.info("Project structure generated")
+            
+            # Step 4: Determine project dependencies
+            dependencies = dependencies_future.result()
+        self.logger.info(f"Determined {len(dependencies)} dependencies")
+        
+        # Step 5: Generate dependency files, so that code generation does not
+        # ask Claude for files that would be replaced anyway
+        dependency_files = self.dependency_manager.generate_dependency_files(dependencies)
+        
+        # Step 6: Generate code files
+        code_files = self.code_generator.generate_code(
+            project_structure, architecture_plan, existing_files=dependency_files
+        )
+        self.logger.info(f"Generated {len(code_files)} code files")
+        
+        # The code generator returns a new dict, so the dependency files are
+        # added to it rather than merging both into a copy
+        code_files.update(dependency_files)
+        
+        return {
+            "project_type": project_type_str,
+            "architecture": architecture_plan,
+            "structure": project_structure,
+            "dependencies": dependencies,
+            "files": code_files
+        }
+    
+    def _save_files(self, files: Dict[str, str], output_dir: str) -> None:
+        """
+        Write generated files under a directory.
+        
+        Files are grouped by directory so each directory is created once,
+        and each file's content is encoded and written in a single call.
+        
+        Args:
+            files: Dictionary mapping relative file paths to content
+            output_dir: Directory to write the files under
+            
+        Raises:
+            ValueError: If a file path resolves to a location outside
+                output_dir, such as an absolute path or one containing "..";
+                nothing is written in that case
+        """
+        root = os.path.realpath(output_dir)
+        files_by_dir: Dict[str, List[Tuple[str, str]]] = {}
+        for path, content in files.items():
+            # Paths come from Claude, so they must not escape the output directory
+            full_path = os.path.realpath(os.path.join(root, path))
+            if os.path.commonpath([root, full_path]) != root or full_path == root:
+                raise ValueError(f"File path outside the output directory: {path}")
+            files_by_dir.setdefault(os.path.dirname(full_path), []).append((full_path, content))
+        
+        for directory, dir_files in files_by_dir.items():
+            os.makedirs(directory, exist_ok=True)
+            for full_path, content in dir_files:
+                with open(full_path, "wb") as f:
+                    f.write(content.encode("utf-8"))
+    
+    async def generate_project_async(self, description: str,
+                                     executor: Optional[Executor] = None) -> str:
         """
         Asynchronously generate a project based on the provided description.
         
         Args:
             description: User's description of the project
+            executor: Optional executor to run the blocking generation in;
+                the event loop's default executor is used if not provided
             
         Returns:
             Project ID that can be used to check status and retrieve results
         """
-        project_id = str(uuid.uuid4())
+        project_id = token_hex(16)
         
         # Initialize project status
         self.projects[project_id] = {
@@ -130,26 +296,35 @@ class ProjectGenerator:
         }
         
         # Start generation in background
-        asyncio.create_task(self._generate_project_task(project_id, description))
+        task = asyncio.create_task(self._generate_project_task(project_id, description, executor))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
         
         return project_id
     
-    async def _generate_project_task(self, project_id: str, description: str) -> None:
+    async def _generate_project_task(self, project_id: str, description: str,
+                                     executor: Optional[Executor] = None) -> None:
         """
         Background task for project generation.
         
+        The project is saved and archived as part of the task, so downloads
+        can serve the archive without rebuilding it.
+        
         Args:
             project_id: ID of the project being generated
             description: User's description of the project
+            executor: Optional executor to run the blocking generation in
         """
         try:
             # Generate project in a separate thread to avoid blocking the event loop
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             result = await loop.run_in_executor(
-                None, self.generate_project, description, None
+                executor, self.generate_project, description,
+                os.path.join(ARCHIVE_ROOT, project_id)
             )
             
             # Update project status
+            result["project_id"] = project_id
             result["status"] = "completed"
             self.projects[project_id] = result
             
@@ -179,6 +354,29 @@ class ProjectGenerator:
         
         return self.projects[project_id]
     
+    def delete_project(self, project_id: str) -> Dict[str, Any]:
+        """
+        Forget a project and remove the files and archive saved for it.
+        
+        Args:
+            project_id: ID of the project to delete
+            
+        Returns:
+            Dictionary containing the deleted project's details
+            
+        Raises:
+            KeyError: If the project ID is not found
+        """
+        if project_id not in self.projects:
+            raise KeyError(f"Project with ID {project_id} not found")
+        
+        project = self.projects.pop(project_id)
+        shutil.rmtree(os.path.join(ARCHIVE_ROOT, project_id), ignore_errors=True)
+        archive_path = project.get("archive_path")
+        if archive_path and os.path.isfile(archive_path):
+            os.remove(archive_path)
+        return project
+    
     def get_project_files(self, project_id: str) -> Dict[str, str]:
         """
         Get the generated files for a completed project.
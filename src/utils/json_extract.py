@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+JSON Extraction Module.
+
+This module locates JSON objects embedded in Claude's free-form responses,
+which may wrap the JSON in prose or Markdown code fences.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.utils import json_utils
+
+
+class JSONObjectScanner:
+    """Incrementally finds balanced JSON objects in text fed in chunks.
+
+    The text is scanned once, tracking brace depth and whether the scan is
+    inside a JSON string, so braces within string values are ignored. Because
+    the scan state is kept between chunks, objects can be found in a streamed
+    response as soon as their closing brace arrives.
+    """
+
+    def __init__(self):
+        """Initialize a scanner that has not seen any text yet."""
+        self._chunks: List[str] = []
+        self._length = 0
+        self._depth = 0
+        self._object_start = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> Iterator[str]:
+        """Scan the next chunk of text.
+
+        Args:
+            chunk: Text following the previously fed chunks
+
+        Yields:
+            Each balanced ``{...}`` substring completed within this chunk
+        """
+        offset = self._length
+        self._chunks.append(chunk)
+        self._length += len(chunk)
+
+        for index, char in enumerate(chunk, offset):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == "{":
+                if self._depth == 0:
+                    self._object_start = index
+                self._depth += 1
+            elif char == "}" and self._depth:
+                self._depth -= 1
+                if self._depth == 0:
+                    yield self._text()[self._object_start:index + 1]
+            elif char == '"' and self._depth:
+                # Quotes in the prose around the object do not start strings
+                self._in_string = True
+
+    def _text(self) -> str:
+        """Get all the text fed so far."""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0]
+
+
+def extract_first_json_object(text: str) -> Optional[str]:
+    """Find the first balanced JSON object in a text.
+
+    Args:
+        text: The text to search
+
+    Returns:
+        The first balanced ``{...}`` substring, or None if there is none
+    """
+    return next(JSONObjectScanner().feed(text), None)
+
+
+def parse_json_object(candidate: str) -> Optional[Dict[str, Any]]:
+    """Parse a candidate found by JSONObjectScanner.
+
+    Args:
+        candidate: A balanced ``{...}`` substring
+
+    Returns:
+        The parsed object, or None if the candidate is not valid JSON
+    """
+    try:
+        return json_utils.loads(candidate)
+    except ValueError:
+        return None
+
+
+def load_first_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """Parse the first valid JSON object embedded in a text.
+
+    Balanced braces that are not valid JSON, such as ``{placeholders}`` in
+    prose, are skipped.
+
+    Args:
+        text: The text to search
+
+    Returns:
+        The parsed object, or None if the text contains no valid JSON object
+    """
+    for candidate in JSONObjectScanner().feed(text):
+        result = parse_json_object(candidate)
+        if result is not None:
+            return result
+    return None
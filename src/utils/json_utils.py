@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+JSON Utilities Module.
+
+This module provides JSON serialization helpers for the Project Architect.
+When the optional ``orjson`` package is installed it is used for encoding
+and decoding, otherwise the helpers fall back to the standard library
+``json`` module.
+"""
+
+import json
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialize an object to compact UTF-8 encoded JSON.
+
+    Args:
+        obj: The object to serialize
+
+    Returns:
+        The JSON document as bytes
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson rejects some inputs the standard library accepts
+            pass
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def dumps(obj: Any, indent: Optional[int] = None) -> str:
+    """Serialize an object to a JSON string.
+
+    Used for JSON embedded in prompts, where the output only needs to be
+    valid, readable JSON and not byte-identical to ``json.dumps``.
+
+    Args:
+        obj: The object to serialize
+        indent: Optional indentation level; orjson supports only 2
+
+    Returns:
+        The JSON document as a string
+    """
+    if orjson is not None and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, option=option).decode("utf-8")
+        except TypeError:
+            # orjson rejects some inputs the standard library accepts
+            pass
+    return json.dumps(obj, indent=indent, ensure_ascii=False)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Deserialize a JSON document.
+
+    Args:
+        data: The JSON document as a string or bytes
+
+    Returns:
+        The deserialized object
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
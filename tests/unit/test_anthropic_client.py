@@ -11,12 +11,16 @@ and code generation.
 
 import json
 import os
+import threading
+import time
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from unittest import mock
 from typing import Dict, Any, List, Optional
 
-from src.clients.anthropic_client import AnthropicClient
+from src.clients.anthropic_client import AnthropicClient, get_default_client
 from src.clients.base_client import BaseClient, ClientError
+from src.clients.llm_cache import InMemoryLRUCache
 
 
 class TestAnthropicClient:
@@ -391,6 +395,129 @@ class TestAnthropicClient:
         result = anthropic_client._extract_text_from_response(response_data)
         assert result == "Text content. More text."
 
+    @mock.patch('src.clients.anthropic_client.anthropic.Anthropic')
+    def test_ask_claude_with_cached_context(self, mock_anthropic):
+        """Test that shared context is sent as a cached system block."""
+        messages = mock_anthropic.return_value.messages
+        messages.create.return_value.content = [mock.MagicMock(text="ok")]
+        config = mock.MagicMock(anthropic_api_key="test_api_key", anthropic_model=None,
+                                anthropic_max_tokens=None)
+        client = AnthropicClient(config)
+
+        assert client.ask_claude("prompt", "system", cached_context="project context") == "ok"
+
+        system = messages.create.call_args[1]["system"]
+        assert system[0] == {"type": "text", "text": "system"}
+        assert system[1]["text"] == "project context"
+        assert system[1]["cache_control"] == {"type": "ephemeral"}
+
+    @mock.patch('src.clients.anthropic_client.anthropic.Anthropic')
+    def test_generate_response_uses_cache(self, mock_anthropic):
+        """Test that repeated prompts are served from the response cache."""
+        messages = mock_anthropic.return_value.messages
+        messages.create.return_value.content = [mock.MagicMock(text="ok")]
+        config = mock.MagicMock(anthropic_api_key="test_api_key", anthropic_model=None,
+                                anthropic_max_tokens=None)
+        client = AnthropicClient(config, cache=InMemoryLRUCache())
+
+        assert client.generate_response("prompt", "system") == "ok"
+        assert client.generate_response("prompt", "system") == "ok"
+        assert client.generate_response("other prompt", "system") == "ok"
+
+        assert messages.create.call_count == 2
+        assert client.cache_stats == {"hits": 1, "misses": 2}
+
+    @mock.patch('src.clients.anthropic_client.anthropic.Anthropic')
+    def test_get_cached_response_with_cache_key(self, mock_anthropic):
+        """Test that responses cached under a caller key are found without the prompt."""
+        messages = mock_anthropic.return_value.messages
+        messages.create.return_value.content = [mock.MagicMock(text="ok")]
+        config = mock.MagicMock(anthropic_api_key="test_api_key", anthropic_model=None,
+                                anthropic_max_tokens=None)
+        client = AnthropicClient(config, cache=InMemoryLRUCache())
+
+        assert client.get_cached_response("plan-key") is None
+        assert client.generate_response("prompt", cache_key="plan-key") == "ok"
+        assert client.get_cached_response("plan-key") == "ok"
+        assert client.get_cached_response("plan-key", model="other-model") is None
+
+        assert messages.create.call_count == 1
+        assert client.cache_stats == {"hits": 1, "misses": 1}
+
+    @mock.patch('src.clients.anthropic_client.anthropic.Anthropic')
+    def test_json_responses_are_cached_apart_from_full_responses(self, mock_anthropic):
+        """Test that an extracted JSON object is never served as a full response."""
+        messages = mock_anthropic.return_value.messages
+        messages.create.return_value.content = [mock.MagicMock(text='{"a": 1} and more')]
+        config = mock.MagicMock(anthropic_api_key="test_api_key", anthropic_model=None,
+                                anthropic_max_tokens=None)
+        client = AnthropicClient(config, cache=InMemoryLRUCache())
+
+        stream = (text for text in ['{"a": 1}', " and more"])
+        with mock.patch.object(client, "stream_claude", return_value=stream):
+            assert client.generate_json_response("prompt", cache_key="key") == '{"a": 1}'
+
+        assert client.get_cached_response("key") is None
+        assert client.get_cached_response("key", json_object=True) == '{"a": 1}'
+        assert client.generate_response("prompt", cache_key="key") == '{"a": 1} and more'
+
+    @mock.patch('src.clients.anthropic_client.anthropic.Anthropic')
+    def test_generate_response_shares_in_flight_requests(self, mock_anthropic):
+        """Test that concurrent identical requests are sent only once."""
+        release = threading.Event()
+        messages = mock_anthropic.return_value.messages
+
+        def create(**kwargs):
+            release.wait(5)
+            return mock.MagicMock(content=[mock.MagicMock(text="ok")])
+
+        messages.create.side_effect = create
+        config = mock.MagicMock(anthropic_api_key="test_api_key", anthropic_model=None,
+                                anthropic_max_tokens=None)
+        clients = [AnthropicClient(config, cache=InMemoryLRUCache()) for _ in range(3)]
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(client.generate_response, "shared prompt") for client in clients]
+            while len(AnthropicClient._in_flight._calls) == 0:
+                time.sleep(0.01)
+            time.sleep(0.1)
+            release.set()
+            responses = [future.result() for future in futures]
+
+        assert responses == ["ok", "ok", "ok"]
+        assert messages.create.call_count == 1
+
+    @mock.patch('src.clients.anthropic_client.anthropic.Anthropic')
+    def test_generate_json_response_stops_after_first_object(self, mock_anthropic):
+        """Test that streaming stops once a complete JSON object has arrived."""
+        sent = []
+
+        def text_stream():
+            for chunk in ['Here you go: {placeholder} {"main": ["fla', 'sk"]}', " and some notes", " that never arrive"]:
+                sent.append(chunk)
+                yield chunk
+
+        stream = mock_anthropic.return_value.messages.stream.return_value.__enter__.return_value
+        stream.text_stream = text_stream()
+        config = mock.MagicMock(anthropic_api_key="test_api_key", anthropic_model=None,
+                                anthropic_max_tokens=None)
+        client = AnthropicClient(config, cache=InMemoryLRUCache())
+
+        assert client.generate_json_response("prompt") == '{"main": ["flask"]}'
+        assert client.generate_json_response("prompt") == '{"main": ["flask"]}'
+        assert len(sent) == 2
+        assert mock_anthropic.return_value.messages.stream.call_count == 1
+
+    @mock.patch('src.clients.anthropic_client._default_client', None)
+    @mock.patch('src.clients.anthropic_client.anthropic.Anthropic')
+    def test_get_default_client_is_shared(self, mock_anthropic):
+        """Test that the default client is created once and shared."""
+        client = get_default_client()
+
+        assert isinstance(client, AnthropicClient)
+        assert get_default_client() is client
+        assert mock_anthropic.call_count == 1
+
 
 if __name__ == "__main__":
     pytest.main(["-v", __file__])
\ No newline at end of file
@@ -450,6 +450,47 @@ class TestArchitectureGenerator:
         assert len(architecture_plan.data_flows) == 1
         assert architecture_plan.data_flows[0].data_type == "JSON"
 
+    def test_architecture_plan_lookups(self):
+        """Test component and dependency lookups, including after reassignment."""
+        architecture_plan = ArchitecturePlan(
+            project_type=mock.MagicMock(),
+            components=[Component(name="API"), Component(name="Database")],
+            dependencies=[
+                Dependency(source="API", target="Database"),
+                Dependency(source="Worker", target="Database")
+            ],
+            data_flows=[]
+        )
+        
+        assert architecture_plan.get_component_by_name("API").name == "API"
+        assert architecture_plan.get_component_by_name("Cache") is None
+        assert [str(dep) for dep in architecture_plan.get_dependencies_for_component("API")] == ["API uses Database"]
+        assert architecture_plan.get_dependent_components("Database") == ["API", "Worker"]
+        assert architecture_plan.get_dependent_components("API") == []
+        
+        architecture_plan.components = [Component(name="Cache")]
+        architecture_plan.dependencies = [Dependency(source="API", target="Cache")]
+        
+        assert architecture_plan.get_component_by_name("API") is None
+        assert architecture_plan.get_component_by_name("Cache").name == "Cache"
+        assert architecture_plan.get_dependent_components("Database") == []
+        assert architecture_plan.get_dependent_components("Cache") == ["API"]
+
+    def test_architecture_plan_dict_views_follow_reassignment(self):
+        """Test that the cached dict views are rebuilt when their lists are reassigned."""
+        architecture_plan = ArchitecturePlan(
+            project_type=mock.MagicMock(),
+            components=[Component(name="API")],
+            dependencies=[],
+            data_flows=[DataFlow(source="API", target="Database", data_description="Rows")]
+        )
+        
+        assert [flow["data_description"] for flow in architecture_plan.data_flows_as_dicts] == ["Rows"]
+        
+        architecture_plan.data_flows = [DataFlow(source="API", target="Cache", data_description="Keys")]
+        
+        assert [flow["data_description"] for flow in architecture_plan.data_flows_as_dicts] == ["Keys"]
+
 
 if __name__ == "__main__":
     pytest.main(["-v", __file__])
\ No newline at end of file
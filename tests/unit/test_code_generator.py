@@ -16,7 +16,7 @@ import pytest
 from unittest import mock
 from typing import Dict, Any, List, Optional
 
-from src.core.code_generator import CodeGenerator
+from src.core.code_generator import CodeGenerator, StreamingCodeExtractor
 from src.models.project_type import ProjectType, ProjectTypeEnum
 from src.models.architecture_plan import ArchitecturePlan, Component, Dependency, DataFlow
 from src.models.project_structure import ProjectStructure, FileNode, DirectoryNode
@@ -544,4 +544,171 @@ def alternative():
             file_paths = [file.path for file in code_files]
             assert "src/test_dir/file1.py" in file_paths
             assert "src/test_dir/file2.js" in file_paths
-            assert "src/test_dir/nested_dir/nested_file.py" in file_paths
\ No newline at end of file
+            assert "src/test_dir/nested_dir/nested_file.py" in file_paths
+
+    def test_generate_code_concurrently_keeps_order(self, code_generator):
+        """Test that parallel generation keeps file order and isolates failures."""
+        structure = ProjectStructure(
+            project_type="python",
+            files=[
+                {"path": "a.py", "components": []},
+                {"path": "b.py", "components": []},
+                {"path": "", "components": []},
+                {"path": "c.py", "components": []},
+            ]
+        )
+        plan = mock.MagicMock(components=[])
+
+        def fake_generate(file_path, **kwargs):
+            if file_path == "b.py":
+                raise RuntimeError("boom")
+            return f"# {file_path}"
+
+        code_generator.max_concurrent_requests = 3
+        with mock.patch.object(code_generator, "_generate_file_code", side_effect=fake_generate):
+            code_files = code_generator.generate_code(structure, plan)
+
+        assert list(code_files) == ["a.py", "b.py", "c.py"]
+        assert code_files["a.py"] == "# a.py"
+        assert code_files["b.py"].startswith("# Error generating code: boom")
+
+    def test_generate_code_batch_marks_failed_requests(self, code_generator):
+        """Test that batch generation maps responses back and flags failures."""
+        structure = ProjectStructure(
+            project_type="python",
+            files=[
+                {"path": "a.py", "components": []},
+                {"path": "b.py", "components": []},
+            ]
+        )
+        plan = mock.MagicMock(components=[])
+        code_generator.anthropic_client.generate_batch_responses.return_value = {
+            "a.py": "```python\nx = 1\n```",
+            "b.py": None,
+        }
+
+        code_files = code_generator.generate_code(structure, plan, batch=True)
+
+        assert code_files["a.py"] == "x = 1"
+        assert code_files["b.py"].startswith("# Error generating code: batch request failed")
+
+    def test_find_related_files_uses_component_index(self, code_generator):
+        """Test that related files are looked up through the component index."""
+        files = [
+            {"path": "a.py", "components": ["Auth", "User"]},
+            {"path": "b.py", "components": ["User"]},
+            {"path": "c.py", "components": ["Billing"]},
+        ]
+        component_index = code_generator._build_component_index(files)
+
+        related = code_generator._find_related_files(["User", "Auth"], component_index)
+
+        assert [file_info["path"] for file_info in related] == ["a.py", "b.py"]
+        assert code_generator._find_related_files(["Missing"], component_index) == []
+
+    def test_get_file_language(self, code_generator):
+        """Test language detection from file paths."""
+        assert code_generator._get_file_language("src/a.b/c.d.py") == "python"
+        assert code_generator._get_file_language("Dockerfile") == "dockerfile"
+        assert code_generator._get_file_language("deploy/.env") == "env"
+        assert code_generator._get_file_language("a.b/README") == "text"
+
+    def test_generate_code_with_file_templates(self, code_generator):
+        """Test that clusters of similar files are rendered from one template."""
+        structure = ProjectStructure(
+            project_type="python",
+            files=[
+                {"path": "src/a/routes.py", "components": []},
+                {"path": "src/b/routes.py", "components": []},
+                {"path": "src/c/routes.py", "components": []},
+                {"path": "main.py", "components": []},
+            ]
+        )
+        plan = mock.MagicMock(components=[])
+        code_generator.use_file_templates = True
+        code_generator.anthropic_client.generate_response.side_effect = None
+        code_generator.anthropic_client.generate_response.return_value = '```python\n"""Routes of $module."""\n```'
+
+        with mock.patch.object(code_generator, "_generate_file_code", return_value="# main") as mock_generate:
+            code_files = code_generator.generate_code(structure, plan)
+
+        assert list(code_files) == ["src/a/routes.py", "src/b/routes.py", "src/c/routes.py", "main.py"]
+        assert code_files["src/b/routes.py"] == '"""Routes of src.b.routes."""'
+        assert code_files["main.py"] == "# main"
+        assert mock_generate.call_count == 1
+        assert code_generator.anthropic_client.generate_response.call_count == 1
+
+    def test_generate_code_streaming(self, code_generator):
+        """Test that streamed responses are yielded as extracted code chunks."""
+        structure = ProjectStructure(
+            project_type="python",
+            files=[{"path": "main.py", "components": []}]
+        )
+        plan = mock.MagicMock(components=[])
+        code_generator.anthropic_client.stream_claude.return_value = iter(
+            ["Sure:\n``", "`python\nprint(", "'hi')\n`", "``\nDone."]
+        )
+
+        chunks = list(code_generator.generate_code_streaming(structure, plan))
+
+        assert all(path == "main.py" for path, _ in chunks)
+        assert "".join(code for _, code in chunks) == "print('hi')"
+
+    def test_streaming_code_extractor_without_code_block(self):
+        """Test that the extractor falls back to the full response."""
+        extractor = StreamingCodeExtractor()
+
+        assert extractor.feed("just ") == ""
+        assert extractor.feed("text ") == ""
+        assert extractor.finish() == "just text"
+
+    def test_generate_response_reuses_cached_responses(self, tmp_path):
+        """Test that identical prompts are answered from the response cache."""
+        with mock.patch("anthropic.Anthropic"):
+            generator = CodeGenerator(api_key="test_api_key", cache_dir=str(tmp_path))
+            with mock.patch.object(generator.anthropic_client, "ask_claude", return_value="cached") as mock_ask:
+                assert generator._generate_response("prompt", "context") == "cached"
+                assert generator._generate_response("prompt", "context") == "cached"
+            assert mock_ask.call_count == 1
+            
+            # A new generator with the same cache_dir finds the persisted response
+            generator = CodeGenerator(api_key="test_api_key", cache_dir=str(tmp_path))
+            with mock.patch.object(generator.anthropic_client, "ask_claude") as mock_ask:
+                assert generator._generate_response("prompt", "context") == "cached"
+            mock_ask.assert_not_called()
+
+    def test_select_model_routes_simple_files_to_fast_model(self, code_generator):
+        """Test that documentation and small component-less files use the fast model."""
+        code_generator.use_fast_model = True
+        code_generator.anthropic_client.fast_model = "fast-model"
+
+        assert code_generator._select_model("markdown", ["Api"], "x" * 10000) == "fast-model"
+        assert code_generator._select_model("python", [], "short prompt") == "fast-model"
+        assert code_generator._select_model("python", ["Api"], "short prompt") is None
+
+        code_generator.use_fast_model = False
+        assert code_generator._select_model("markdown", [], "short prompt") is None
+
+    def test_generate_code_renders_trivial_files_locally(self, code_generator):
+        """Test that trivial and pre-generated files skip Claude."""
+        structure = ProjectStructure(
+            project_type="python",
+            files=[
+                {"path": "src/app/__init__.py", "components": []},
+                {"path": ".gitignore", "components": []},
+                {"path": "requirements.txt", "components": []},
+                {"path": "main.py", "components": ["App"]},
+            ]
+        )
+        plan = mock.MagicMock(components=[])
+
+        with mock.patch.object(code_generator, "_generate_file_code", return_value="# main") as mock_generate:
+            code_files = code_generator.generate_code(
+                structure, plan, existing_files={"requirements.txt": "fastapi\n"}
+            )
+
+        assert code_files["src/app/__init__.py"] == '"""app package."""\n'
+        assert "__pycache__/" in code_files[".gitignore"]
+        assert code_files["requirements.txt"] == "fastapi\n"
+        assert code_files["main.py"] == "# main"
+        assert mock_generate.call_count == 1
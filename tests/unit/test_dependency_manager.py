@@ -17,6 +17,7 @@ from typing import Dict, Any, List, Optional
 
 from src.core.dependency_manager import DependencyManager
 from src.models.project_type import ProjectType, ProjectTypeEnum
+from src.models.architecture_plan import ArchitecturePlan, Component
 from src.models.dependency_spec import DependencySpec
 from src.clients.anthropic_client import AnthropicClient
 from src.clients.github_client import GithubClient
@@ -539,5 +540,84 @@ class TestDependencyManager:
         assert "json" in prompt.lower()
         assert "format" in prompt.lower()
 
+    def test_determine_dependencies_batch(self, dependency_manager):
+        """Test determining dependencies for several projects in one batch."""
+        architecture_plan = ArchitecturePlan(
+            project_type=ProjectType(type_enum=ProjectTypeEnum.PYTHON),
+            components=[Component("api", "Serve requests", ["Routing"], ["fastapi"])],
+            dependencies=[],
+            data_flows=[]
+        )
+        dependency_manager.anthropic_client = mock.MagicMock()
+        dependency_manager.anthropic_client.generate_batch_responses.return_value = {
+            "0": json.dumps({"main": ["fastapi"], "test": ["pytest"], "dev": []}),
+            "1": None,
+        }
+
+        results = dependency_manager.determine_dependencies_batch([
+            ("python", architecture_plan),
+            ("node", architecture_plan),
+        ])
+
+        assert results == [["fastapi", "pytest"], []]
+        prompts = dependency_manager.anthropic_client.generate_batch_responses.call_args[0][0]
+        assert set(prompts) == {"0", "1"}
+
+    def test_parse_dependencies_response_merges_categories(self, dependency_manager):
+        """Test that packages listed in several categories are kept once."""
+        response = json.dumps({
+            "main": ["flask==2.0.1", "requests[socks]>=2.0"],
+            "test": ["pytest>=7.0", "Flask"],
+            "dev": ["pytest"],
+        })
+
+        dependencies = dependency_manager._parse_dependencies_response(response)
+
+        assert dependencies == ["flask==2.0.1", "requests[socks]>=2.0", "pytest>=7.0"]
+
+    def test_parse_dependencies_response_extracts_embedded_json(self, dependency_manager):
+        """Test that JSON wrapped in prose and code fences is extracted."""
+        response = (
+            'Here are the "dependencies" {you asked for}:\n```json\n'
+            '{"main": ["flask"], "test": ["pytest"], "dev": ["black  # {not} \\"a brace\\""]}\n```'
+        )
+
+        dependencies = dependency_manager._parse_dependencies_response(response)
+
+        assert dependencies == ["flask", "pytest", 'black  # {not} "a brace"']
+
+    def test_parse_dependencies_response_keeps_artifacts_of_same_group(self, dependency_manager):
+        """Test that Maven artifacts sharing a groupId are not deduplicated."""
+        response = json.dumps({
+            "main": [
+                "org.springframework.boot:spring-boot-starter-web",
+                "org.springframework.boot:spring-boot-starter-data-jpa:3.1.0",
+            ],
+            "test": ["org.springframework.boot:spring-boot-starter-data-jpa"],
+            "dev": [],
+        })
+
+        dependencies = dependency_manager._parse_dependencies_response(response)
+
+        assert dependencies == [
+            "org.springframework.boot:spring-boot-starter-web",
+            "org.springframework.boot:spring-boot-starter-data-jpa:3.1.0",
+        ]
+
+    def test_determine_project_type_from_dependencies(self, dependency_manager):
+        """Test that the project type is detected from known package names."""
+        determine = dependency_manager._determine_project_type_from_dependencies
+
+        assert determine(["Flask==2.0.1", "gunicorn"]) == "python"
+        assert determine(["'express': '^4.17.1'", "jest:^29.0.0"]) == "node"
+        assert determine(["left-pad"]) == "python"
+
+    def test_generate_dependency_files_cleans_requirements(self, dependency_manager):
+        """Test that requirements.txt entries are stripped and blank ones dropped."""
+        files = dependency_manager.generate_dependency_files([" 'flask==2.0.1', ", "", "  ", '"requests"'])
+
+        assert files["requirements.txt"] == "flask==2.0.1\nrequests\n"
+
+
 if __name__ == "__main__":
     pytest.main(["-v", __file__])
\ No newline at end of file
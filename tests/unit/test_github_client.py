@@ -668,6 +668,24 @@ class TestGithubClient:
             
             assert "Failed to get project structure statistics" in str(excinfo.value)
 
+    def test_make_request_conditional_get(self, mock_requests):
+        """Test that repeated requests revalidate with the cached ETag."""
+        config = mock.MagicMock(github_token="test_token")
+        client = GithubClient(config)
+
+        first = mock.MagicMock(status_code=200, headers={"ETag": '"abc"'})
+        first.json.return_value = {"name": "test-repo"}
+        not_modified = mock.MagicMock(status_code=304, headers={})
+        mock_requests.get.side_effect = [first, not_modified]
+
+        assert client._make_request("repos/test-user/test-repo") == {"name": "test-repo"}
+        assert client._make_request("repos/test-user/test-repo") == {"name": "test-repo"}
+
+        second_headers = mock_requests.get.call_args_list[1][1]["headers"]
+        assert second_headers["If-None-Match"] == '"abc"'
+        assert "If-None-Match" not in client.headers
+        not_modified.json.assert_not_called()
+
 
 if __name__ == "__main__":
     pytest.main(["-v", __file__])
\ No newline at end of file
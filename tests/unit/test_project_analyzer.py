@@ -302,6 +302,92 @@ class TestProjectAnalyzer:
         assert "project_type" in result
         assert "requirements" in result
 
+    def test_analyze_uses_single_request(self, project_analyzer, sample_project_description):
+        """Test that project type and requirements are determined with one request."""
+        project_analyzer.anthropic_client.generate_json_response.return_value = (
+            "```json\n" + json.dumps({
+                "project_type": "web",
+                "explanation": "A browser-based expense tracker",
+                "requirements": ["Track daily expenses", " ", "Generate reports"]
+            }) + "\n```"
+        )
+
+        project_type, requirements = project_analyzer.analyze(sample_project_description)
+
+        assert project_type == "web"
+        assert requirements == ["Track daily expenses", "Generate reports"]
+        project_analyzer.anthropic_client.generate_json_response.assert_called_once()
+
+    def test_analyze_project_returns_project_type(self, project_analyzer, sample_project_description):
+        """Test that analyze_project returns the full project type with one request."""
+        project_analyzer.anthropic_client.generate_json_response.return_value = json.dumps({
+            "project_type": "cli",
+            "explanation": "Runs in a terminal",
+            "requirements": ["Parse arguments"]
+        })
+
+        project_type, requirements = project_analyzer.analyze_project(sample_project_description)
+
+        assert project_type.type_enum == ProjectTypeEnum.CLI
+        assert project_type.description == "Runs in a terminal"
+        assert requirements == ["Parse arguments"]
+        project_analyzer.anthropic_client.generate_json_response.assert_called_once()
+
+    def test_analyze_combined_invalid_project_type(self, project_analyzer, sample_project_description):
+        """Test that an unknown project type raises a ValueError."""
+        project_analyzer.anthropic_client.generate_json_response.return_value = json.dumps({
+            "project_type": "SPACESHIP",
+            "requirements": []
+        })
+
+        with pytest.raises(ValueError):
+            project_analyzer.analyze_combined(sample_project_description)
+
+    def test_analyze_falls_back_to_separate_requests(self, project_analyzer, sample_project_description):
+        """Test that an unparseable combined response falls back to separate requests."""
+        project_analyzer.anthropic_client.generate_json_response.return_value = "not json"
+        project_analyzer.anthropic_client.generate_response.side_effect = lambda prompt: (
+            "WEB: A browser-based expense tracker" if "project type" in prompt
+            else "1. Track daily expenses\n2) Generate reports"
+        )
+
+        project_type, requirements = project_analyzer.analyze(sample_project_description)
+
+        assert project_type == "web"
+        assert requirements == ["Track daily expenses", "Generate reports"]
+        assert project_analyzer.anthropic_client.generate_response.call_count == 2
+
+    def test_analyze_reuses_responses_for_similar_descriptions(self, project_analyzer):
+        """Test that a semantic cache serves differently worded descriptions."""
+        pytest.importorskip("numpy")
+        from src.clients.llm_cache import SemanticCache
+
+        embeddings = {
+            "An app to track daily expenses": [1.0, 0.0, 0.1],
+            "Application for tracking my daily spending": [0.98, 0.02, 0.12],
+            "A multiplayer space shooter": [0.0, 1.0, 0.0],
+        }
+        project_analyzer.semantic_cache = SemanticCache(embed=embeddings.__getitem__)
+        project_analyzer.anthropic_client.generate_json_response.return_value = json.dumps({
+            "project_type": "web",
+            "explanation": "A browser-based expense tracker",
+            "requirements": ["Track daily expenses"]
+        })
+
+        for description in embeddings:
+            project_analyzer.analyze(description)
+
+        assert project_analyzer.anthropic_client.generate_json_response.call_count == 2
+
+    def test_analyze_project_description_parses_markdown_answer(self, project_analyzer, sample_project_description):
+        """Test that Markdown around the project type answer is tolerated."""
+        project_analyzer.anthropic_client.generate_response.return_value = "**FastAPI**: A REST API for expenses"
+
+        project_type = project_analyzer.analyze_project_description(sample_project_description)
+
+        assert project_type.type_enum == ProjectTypeEnum.FASTAPI
+        assert project_type.description == "A REST API for expenses"
+
 
 if __name__ == "__main__":
     pytest.main(["-v", __file__])
\ No newline at end of file
@@ -423,4 +423,36 @@ class TestProjectStructureGenerator:
         with pytest.raises(ValueError) as excinfo:
             project_structure_generator._validate_structure(invalid_structure)
         
-        assert "Parent directory not found" in str(excinfo.value)
\ No newline at end of file
+        assert "Parent directory not found" in str(excinfo.value)
+
+    def test_create_structure_prompt_omits_empty_sections(self, project_structure_generator):
+        """Test that sections missing from the plan are left out of the prompt."""
+        plan = ArchitecturePlan(
+            project_type=ProjectType(type_enum=ProjectTypeEnum.PYTHON),
+            components=[Component("api", "Serve requests", ["Routing"], ["flask"])],
+            dependencies=[],
+            data_flows=[]
+        )
+
+        prompt = project_structure_generator._create_structure_prompt(plan, {"style": "src layout"})
+
+        assert "Project Type: python" in prompt
+        assert '"api"' in prompt
+        assert '\n  ' not in prompt.split("Provide your response")[0]
+        assert "Additional context:" in prompt
+        assert "Dependencies:" not in prompt
+        assert "Data Flows:" not in prompt
+
+    def test_structure_tree_normalizes_file_parents(self):
+        """Test that files with irregular paths are attached to their directory."""
+        structure = ProjectStructure(
+            project_type="python",
+            directories=["src"],
+            files=[{"path": "./src/main.py"}, {"path": "src//util.py"}, {"path": "./setup.py"}]
+        )
+
+        src_dir = next(child for child in structure.root.children if child.path == "src")
+
+        assert [child.path for child in src_dir.children] == ["./src/main.py", "src//util.py"]
+        assert [child.path for child in structure.root.children] == ["src", "./setup.py"]
+        assert structure.find_file("./src/main.py").path == "./src/main.py"